@@ -15,6 +15,7 @@ from src.api.routes import router as api_router
 
 try:
     from shared.utils.logging import setup_logging, get_logger, set_correlation_id
+    from shared.utils.http_client import close_all_clients
 except ImportError:
     import logging
     import sys
@@ -31,6 +32,9 @@ except ImportError:
     
     def set_correlation_id(cid: str):
         pass
+    
+    async def close_all_clients():
+        pass
 
 
 settings = get_settings()
@@ -58,6 +62,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     yield
     
     logger.info("Shutting down Audit Service...")
+    await close_all_clients()
 
 
 app = FastAPI(
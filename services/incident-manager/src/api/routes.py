@@ -11,6 +11,7 @@ import uuid
 from src.config import get_settings
 from src.api.schemas import (
     AnomalyEventInput,
+    AnomalyEventBatchInput,
     LogAnalysisEventInput,
     Incident,
     IncidentListResponse,
@@ -43,8 +44,24 @@ async def receive_anomaly_event(event: AnomalyEventInput, request: Request):
     
     Creates or updates an incident based on the event.
     """
-    store = request.app.state.incident_store
+    return await _ingest_anomaly_event(event, request.app.state.incident_store)
+
+
+@router.post("/events/anomaly/batch", status_code=202, tags=["events"])
+async def receive_anomaly_event_batch(batch: AnomalyEventBatchInput, request: Request):
+    """
+    Receive a batch of anomaly events from the monitoring service.
     
+    Events are ingested in order, so later events in the batch correlate
+    with incidents created by earlier ones.
+    """
+    store = request.app.state.incident_store
+    results = [await _ingest_anomaly_event(event, store) for event in batch.events]
+    return {"received": len(results), "results": results}
+
+
+async def _ingest_anomaly_event(event: AnomalyEventInput, store) -> dict:
+    """Correlate an anomaly event with an open incident or create a new one."""
     # Check for existing incident to correlate
     existing = store.find_related_incident(
         service=event.target_service,
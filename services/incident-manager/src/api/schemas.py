@@ -53,6 +53,12 @@ class AnomalyEventInput(BaseModel):
     correlation_id: Optional[str] = None
 
 
+class AnomalyEventBatchInput(BaseModel):
+    """Batch of anomaly events coalesced by the monitoring service."""
+
+    events: list[AnomalyEventInput] = Field(default_factory=list)
+
+
 class LogAnalysisEventInput(BaseModel):
     """Incoming log analysis event."""
     
@@ -0,0 +1,135 @@
+"""
+AutoHeal AI - Incident Manager Tests
+=====================================
+
+Unit tests for the incident manager event ingestion.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.api.schemas import AnomalyEventBatchInput, AnomalyEventInput
+
+
+def make_event(event_id: str, service: str = "payment-service") -> dict:
+    """Build an anomaly event payload as sent by the monitoring service."""
+    return {
+        "event_id": event_id,
+        "anomaly_type": "error_rate_spike",
+        "severity": "high",
+        "target_service": service,
+        "target_namespace": "production",
+        "metric_name": "error_rate",
+        "current_value": 0.2,
+        "threshold_value": 0.05,
+    }
+
+
+@pytest.fixture
+def store():
+    """Create an empty incident store."""
+    from src.core.incident_store import IncidentStore
+    return IncidentStore()
+
+
+@pytest.fixture
+def client(store):
+    """TestClient for the API routes with healing calls stubbed out."""
+    from src.api.routes import router
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    app.state.incident_store = store
+
+    with patch("src.api.routes._trigger_healing", AsyncMock()):
+        yield TestClient(app)
+
+
+class TestAnomalyEventBatchSchema:
+    """Tests for the anomaly event batch schema."""
+    
+    def test_batch_parses_events(self):
+        """Test parsing the body the monitoring alerter sends."""
+        batch = AnomalyEventBatchInput.model_validate_json(
+            b'{"events":[' + b",".join(
+                AnomalyEventInput(**make_event(f"evt-{i}")).model_dump_json().encode()
+                for i in range(2)
+            ) + b"]}"
+        )
+        
+        assert [e.event_id for e in batch.events] == ["evt-0", "evt-1"]
+        assert batch.events[0].source_service == "monitoring"
+    
+    def test_batch_defaults_to_empty(self):
+        """Test that a batch without events is empty rather than invalid."""
+        assert AnomalyEventBatchInput().events == []
+    
+    def test_batch_rejects_invalid_event(self):
+        """Test that one malformed event fails the whole batch."""
+        bad = make_event("evt-1")
+        del bad["metric_name"]
+        
+        with pytest.raises(ValidationError):
+            AnomalyEventBatchInput(events=[make_event("evt-0"), bad])
+
+
+class TestAnomalyEventIngestion:
+    """Tests for single and batched anomaly event ingestion."""
+    
+    @pytest.mark.asyncio
+    async def test_ingest_creates_then_correlates(self, store):
+        """Test that a second event for a service joins the open incident."""
+        from src.api.routes import _ingest_anomaly_event
+        
+        with patch("src.api.routes._trigger_healing", AsyncMock()) as mock_heal:
+            first = await _ingest_anomaly_event(AnomalyEventInput(**make_event("evt-0")), store)
+            second = await _ingest_anomaly_event(AnomalyEventInput(**make_event("evt-1")), store)
+        
+        assert first["action"] == "created"
+        assert second == {"action": "correlated", "incident_id": first["incident_id"]}
+        assert store.get_incident(first["incident_id"]).event_ids == ["evt-0", "evt-1"]
+        mock_heal.assert_called_once()
+    
+    def test_batch_endpoint_ingests_in_order(self, client, store):
+        """Test that batched events are ingested in order and correlated."""
+        response = client.post(
+            "/api/v1/events/anomaly/batch",
+            json={"events": [
+                make_event("evt-0"),
+                make_event("evt-1"),
+                make_event("evt-2", service="checkout-service"),
+            ]}
+        )
+        
+        assert response.status_code == 202
+        body = response.json()
+        assert body["received"] == 3
+        assert [r["action"] for r in body["results"]] == ["created", "correlated", "created"]
+        assert body["results"][0]["incident_id"] == body["results"][1]["incident_id"]
+    
+    def test_batch_endpoint_rejects_invalid_batch(self, client, store):
+        """Test that a malformed batch is rejected without ingesting anything."""
+        bad = make_event("evt-1")
+        del bad["target_service"]
+        
+        response = client.post(
+            "/api/v1/events/anomaly/batch",
+            json={"events": [make_event("evt-0"), bad]}
+        )
+        
+        assert response.status_code == 422
+        assert store.find_related_incident("payment-service", "production") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -27,6 +27,7 @@ from src.api.routes import router as api_router
 # Try to import shared logging
 try:
     from shared.utils.logging import setup_logging, get_logger, set_correlation_id
+    from shared.utils.http_client import close_all_clients
 except ImportError:
     import logging
     import sys
@@ -43,6 +44,9 @@ except ImportError:
     
     def set_correlation_id(cid: str):
         pass
+    
+    async def close_all_clients():
+        pass
 
 
 settings = get_settings()
@@ -81,6 +85,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     # Shutdown
     logger.info("Shutting down log intelligence service...")
     await analyzer.shutdown()
+    await close_all_clients()
     logger.info("Log intelligence service shutdown complete")
 
 
@@ -44,10 +44,24 @@ def get_collector() -> MetricsCollector:
     """Get or create the metrics collector instance."""
     global _collector
     if _collector is None:
-        _collector = MetricsCollector(settings.prometheus_url)
+        _collector = MetricsCollector(
+            settings.prometheus_url,
+            timeout_seconds=settings.prometheus_timeout_seconds
+        )
     return _collector
 
 
+def set_collector(collector: MetricsCollector | None) -> None:
+    """
+    Register the collector the routes use.
+    
+    Called from the application lifespan so routes share the polling
+    loop's collector and its pooled Prometheus client.
+    """
+    global _collector
+    _collector = collector
+
+
 def get_detector() -> AnomalyDetector:
     """Get or create the anomaly detector instance."""
     global _detector
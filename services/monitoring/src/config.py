@@ -44,6 +44,10 @@ class Settings(BaseSettings):
         default=True,
         description="Output logs as JSON"
     )
+    log_binary: bool = Field(
+        default=False,
+        description="Output logs as a stream of MessagePack records instead of JSON (requires msgspec)"
+    )
     
     # Prometheus integration
     prometheus_url: str = Field(
@@ -54,6 +58,16 @@ class Settings(BaseSettings):
         default=10.0,
         description="Timeout for Prometheus queries"
     )
+    prometheus_scrape_interval: int = Field(
+        default=15,
+        gt=0,
+        description="Prometheus scrape_interval; polls are aligned to its boundaries"
+    )
+    prometheus_scrape_offset_seconds: float = Field(
+        default=1.0,
+        gt=0,
+        description="Delay after a scrape boundary before polling, to let samples land"
+    )
     
     # Downstream services
     incident_manager_url: str = Field(
@@ -68,6 +82,7 @@ class Settings(BaseSettings):
     # Polling configuration
     polling_interval_seconds: int = Field(
         default=15,
+        gt=0,
         description="How often to poll for metrics"
     )
     polling_enabled: bool = Field(
@@ -103,9 +118,13 @@ class Settings(BaseSettings):
         description="Minimum time between duplicate alerts"
     )
     alert_batch_size: int = Field(
-        default=10,
+        default=100,
         description="Maximum alerts to send in a batch"
     )
+    alert_batch_delay_ms: int = Field(
+        default=250,
+        description="Maximum time an alert waits to be batched before sending"
+    )
     
     class Config:
         env_prefix = ""  # No prefix for environment variables
@@ -0,0 +1,52 @@
+"""
+AutoHeal AI - Standalone Fallbacks
+===================================
+
+Minimal stand-ins for the shared package types, used when the monitoring
+service runs without `shared` on the path (e.g. standalone testing).
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+
+def get_logger(name: str):
+    return logging.getLogger(name)
+
+
+class AnomalyType(str, Enum):
+    ERROR_RATE_SPIKE = "error_rate_spike"
+    LATENCY_SPIKE = "latency_spike"
+    CPU_OVERLOAD = "cpu_overload"
+    MEMORY_OVERLOAD = "memory_overload"
+    POD_CRASH_LOOP = "pod_crash_loop"
+
+
+class Severity(str, Enum):
+    CRITICAL = "critical"
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+    INFO = "info"
+
+
+# Simple event class for standalone mode
+@dataclass(slots=True)
+class AnomalyEvent:
+    event_id: str
+    timestamp: datetime
+    source_service: str
+    anomaly_type: AnomalyType
+    severity: Severity
+    target_service: str
+    target_namespace: str
+    metric_name: str
+    current_value: float
+    threshold_value: float
+    correlation_id: Optional[str] = None
+    threshold_direction: str = "above"
+    metric_window_seconds: int = 60
+    additional_context: Optional[dict] = None
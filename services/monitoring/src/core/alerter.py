@@ -6,13 +6,14 @@ Sends anomaly events to the Incident Manager service.
 Handles batching, retries, and failure logging.
 """
 
+import asyncio
 from datetime import datetime
 from typing import Optional
 import httpx
+import orjson
 
-# Try to import shared types and logging
+# Try to import shared logging
 try:
-    from shared.schemas.events import AnomalyEvent
     from shared.utils.logging import get_logger
 except ImportError:
     import logging
@@ -30,18 +31,30 @@ class Alerter:
     - Serialize AnomalyEvent objects to JSON
     - Send HTTP POST requests to the Incident Manager
     - Handle failures gracefully with logging
-    - Support batch sending for efficiency
+    - Coalesce events into batched POSTs for efficiency
+    
+    Once start_batching() has been called, send_anomaly_events() only
+    enqueues; a background task flushes the queue every
+    max_batch_delay_seconds or as soon as max_batch_size events are
+    waiting, whichever comes first.
     
     Example:
         alerter = Alerter("http://incident-manager:8002")
+        alerter.start_batching()
         await alerter.send_anomaly_events(anomalies)
+        ...
+        await alerter.stop_batching()
     """
     
     def __init__(
         self,
         incident_manager_url: str,
         timeout_seconds: float = 10.0,
-        max_retries: int = 3
+        max_retries: int = 3,
+        retry_delay_seconds: float = 0.5,
+        max_batch_size: int = 100,
+        max_batch_delay_seconds: float = 0.25,
+        client: httpx.AsyncClient | None = None
     ):
         """
         Initialize the alerter.
@@ -49,12 +62,24 @@ class Alerter:
         Args:
             incident_manager_url: URL of the Incident Manager service
             timeout_seconds: HTTP request timeout
-            max_retries: Maximum retry attempts for failed sends
+            max_retries: Maximum retry attempts for failed batch sends
+            retry_delay_seconds: Delay before the first retry, doubled
+                for each later one
+            max_batch_size: Flush the queue once this many events are waiting
+            max_batch_delay_seconds: Longest an event waits in the queue
+            client: Application-owned HTTP client to reuse; when given,
+                close() leaves it open for its owner to close
         """
         self.incident_manager_url = incident_manager_url.rstrip("/")
         self.timeout = timeout_seconds
         self.max_retries = max_retries
-        self._client: httpx.AsyncClient | None = None
+        self.retry_delay = retry_delay_seconds
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay_seconds
+        self._client: httpx.AsyncClient | None = client
+        self._owns_client = client is None
+        self._queue: asyncio.Queue | None = None
+        self._batcher_task: asyncio.Task | None = None
     
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create an HTTP client."""
@@ -94,6 +119,17 @@ class Alerter:
         else:
             raise ValueError(f"Cannot serialize event type: {type(event)}")
     
+    def _encode_event(self, event) -> bytes:
+        """
+        Encode an AnomalyEvent as a JSON request body.
+        
+        Pydantic events use their model's compiled JSON serializer;
+        anything else is serialized via _serialize_event.
+        """
+        if hasattr(event, 'model_dump_json'):
+            return event.model_dump_json().encode()
+        return orjson.dumps(self._serialize_event(event))
+    
     async def send_anomaly_event(self, event) -> bool:
         """
         Send a single anomaly event to the Incident Manager.
@@ -107,11 +143,11 @@ class Alerter:
         client = await self._get_client()
         
         try:
-            payload = self._serialize_event(event)
+            payload = self._encode_event(event)
             
             response = await client.post(
                 f"{self.incident_manager_url}/api/v1/events/anomaly",
-                json=payload,
+                content=payload,
                 headers={
                     "Content-Type": "application/json",
                     "X-Source-Service": "monitoring"
@@ -156,38 +192,198 @@ class Alerter:
         """
         Send multiple anomaly events to the Incident Manager.
         
-        Sends events sequentially and tracks success/failure counts.
-        In production, consider implementing batch endpoints.
+        While the batcher is running the events are enqueued and this
+        returns immediately; otherwise they are sent right away as a
+        single batch request.
         
         Args:
             events: List of AnomalyEvent objects to send
             
         Returns:
-            Dictionary with 'sent' and 'failed' counts
+            Dictionary with 'sent', 'failed' and 'queued' counts
         """
         if not events:
-            return {"sent": 0, "failed": 0}
+            return {"sent": 0, "failed": 0, "queued": 0}
+        
+        task = self._batcher_task
+        queue = self._queue
+        if task is not None and queue is not None:
+            if not task.done():
+                put = queue.put_nowait
+                for event in events:
+                    put(event)
+                return {"sent": 0, "failed": 0, "queued": len(events)}
+            
+            # The batcher died; send what it left behind along with these
+            # events directly rather than queueing into a dead task
+            error = None if task.cancelled() else task.exception()
+            logger.error(
+                f"Alert batcher stopped unexpectedly, sending directly: {error}",
+                extra={"error": str(error)}
+            )
+            self._batcher_task = None
+            self._queue = None
+            leftovers = []
+            while not queue.empty():
+                event = queue.get_nowait()
+                if event is not None:
+                    leftovers.append(event)
+            events = leftovers + list(events)
+        
+        result = await self._send_batch(events)
+        result["queued"] = 0
+        return result
+    
+    async def _send_batch(self, events: list) -> dict:
+        """
+        POST a list of anomaly events in one request.
         
-        sent = 0
-        failed = 0
+        The body is assembled from the per-event encodings so pydantic
+        events never round-trip through intermediate dicts. Transport
+        errors and 429/5xx replies are retried up to max_retries times
+        with exponential backoff; if the batch still is not accepted (or
+        is rejected outright, e.g. by an Incident Manager without the
+        batch endpoint) the events are sent one at a time instead.
         
-        for event in events:
-            success = await self.send_anomaly_event(event)
-            if success:
-                sent += 1
-            else:
-                failed += 1
+        Args:
+            events: List of AnomalyEvent objects to send
+            
+        Returns:
+            Dictionary with 'sent' and 'failed' counts
+        """
+        client = await self._get_client()
+        
+        try:
+            payload = b'{"events":[' + b",".join(
+                [self._encode_event(event) for event in events]
+            ) + b"]}"
+        except Exception as e:
+            logger.error(
+                f"Error encoding anomaly batch: {e}",
+                extra={"total": len(events), "error": str(e)}
+            )
+            return await self._send_individually(events)
+        
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self.retry_delay * (2 ** (attempt - 1)))
+            
+            try:
+                response = await client.post(
+                    f"{self.incident_manager_url}/api/v1/events/anomaly/batch",
+                    content=payload,
+                    headers={
+                        "Content-Type": "application/json",
+                        "X-Source-Service": "monitoring"
+                    }
+                )
+            except httpx.HTTPError as e:
+                logger.warning(
+                    f"HTTP error sending anomaly batch: {e}",
+                    extra={"total": len(events), "attempt": attempt + 1, "error": str(e)}
+                )
+                continue
+            
+            if response.status_code in (200, 201, 202):
+                logger.info(
+                    f"Batch alert complete",
+                    extra={"total": len(events), "sent": len(events), "failed": 0}
+                )
+                return {"sent": len(events), "failed": 0}
+            
+            logger.warning(
+                f"Failed to send anomaly batch: {response.status_code}",
+                extra={
+                    "total": len(events),
+                    "attempt": attempt + 1,
+                    "status_code": response.status_code,
+                    "response": response.text
+                }
+            )
+            if response.status_code != 429 and response.status_code < 500:
+                # Retrying a request the server rejected will not help
+                break
+        
+        return await self._send_individually(events)
+    
+    async def _send_individually(self, events: list) -> dict:
+        """
+        Send events one request each after a batch could not be delivered.
+        
+        Args:
+            events: List of AnomalyEvent objects to send
+            
+        Returns:
+            Dictionary with 'sent' and 'failed' counts
+        """
+        logger.warning(
+            f"Falling back to per-event alerts",
+            extra={"total": len(events)}
+        )
+        results = await asyncio.gather(
+            *[self.send_anomaly_event(event) for event in events]
+        )
+        sent = sum(results)
         
         logger.info(
             f"Batch alert complete",
-            extra={
-                "total": len(events),
-                "sent": sent,
-                "failed": failed
-            }
+            extra={"total": len(events), "sent": sent, "failed": len(events) - sent}
         )
+        return {"sent": sent, "failed": len(events) - sent}
+    
+    def start_batching(self) -> None:
+        """Start the background task that coalesces queued events."""
+        if self._batcher_task is None:
+            queue: asyncio.Queue = asyncio.Queue()
+            self._queue = queue
+            self._batcher_task = asyncio.create_task(self._run_batcher(queue))
+    
+    async def stop_batching(self) -> None:
+        """
+        Flush any queued events and stop the batcher.
         
-        return {"sent": sent, "failed": failed}
+        Events sent after this returns go out immediately again.
+        """
+        task = self._batcher_task
+        queue = self._queue
+        if task is None or queue is None:
+            return
+        
+        self._batcher_task = None
+        self._queue = None
+        if task.done():
+            return
+        queue.put_nowait(None)  # Sentinel: drain what is queued, then exit
+        await task
+    
+    async def _run_batcher(self, queue: asyncio.Queue) -> None:
+        """Drain the queue into batches bounded by size and delay."""
+        loop = asyncio.get_running_loop()
+        max_size = self.max_batch_size
+        stopping = False
+        
+        while not stopping:
+            event = await queue.get()
+            if event is None:
+                break
+            
+            batch = [event]
+            deadline = loop.time() + self.max_batch_delay
+            
+            while len(batch) < max_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if event is None:
+                    stopping = True
+                    break
+                batch.append(event)
+            
+            await self._send_batch(batch)
     
     async def check_incident_manager_health(self) -> bool:
         """
@@ -210,7 +406,8 @@ class Alerter:
             return False
     
     async def close(self) -> None:
-        """Close the HTTP client."""
-        if self._client:
+        """Flush queued events and close the HTTP client if we created it."""
+        await self.stop_batching()
+        if self._client and self._owns_client:
             await self._client.aclose()
-            self._client = None
+        self._client = None
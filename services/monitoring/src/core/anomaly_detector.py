@@ -11,10 +11,15 @@ Supports multiple detection methods:
 This module is the decision maker for when to trigger alerts.
 """
 
+from bisect import bisect_right
+from heapq import heappop, heappush
 from datetime import datetime
 from dataclasses import dataclass
-from typing import Optional
-import uuid
+from os import urandom
+from typing import Any, Callable, ClassVar, Optional
+import logging
+import math
+import time
 
 # Try to import shared types and logging
 try:
@@ -22,51 +27,33 @@ try:
     from shared.schemas.events import AnomalyEvent
     from shared.utils.logging import get_logger
 except ImportError:
-    # Fallback definitions for standalone testing
-    import logging
-    from enum import Enum
-    
-    def get_logger(name: str):
-        return logging.getLogger(name)
-    
-    class AnomalyType(str, Enum):
-        ERROR_RATE_SPIKE = "error_rate_spike"
-        LATENCY_SPIKE = "latency_spike"
-        CPU_OVERLOAD = "cpu_overload"
-        MEMORY_OVERLOAD = "memory_overload"
-        POD_CRASH_LOOP = "pod_crash_loop"
-    
-    class Severity(str, Enum):
-        CRITICAL = "critical"
-        HIGH = "high"
-        MEDIUM = "medium"
-        LOW = "low"
-        INFO = "info"
-    
-    # Simple event class for standalone mode
-    @dataclass
-    class AnomalyEvent:
-        event_id: str
-        timestamp: datetime
-        source_service: str
-        anomaly_type: AnomalyType
-        severity: Severity
-        target_service: str
-        target_namespace: str
-        metric_name: str
-        current_value: float
-        threshold_value: float
-        correlation_id: Optional[str] = None
-        threshold_direction: str = "above"
-        metric_window_seconds: int = 60
-        additional_context: dict = None
+    # Fallback definitions for standalone testing. They live in their own
+    # module because mypyc cannot compile conditional class definitions.
+    from src.core._standalone import (  # type: ignore[assignment]
+        AnomalyType,
+        Severity,
+        AnomalyEvent,
+        get_logger,
+    )
 
 from src.api.schemas import ServiceMetrics, MetricValue, MetricType
 
 logger = get_logger(__name__)
 
+# Size of the direct-mapped cooldown cache; must be a power of two
+COOLDOWN_CACHE_SLOTS = 256
+
+# (anomaly_type, metric_name, current_value, threshold_value, additional_context)
+Violation = tuple[AnomalyType, str, float, float, Optional[dict]]
+
+# Wire strings for enum members. `.value` is a Python-level property on Enum,
+# so hot paths look the string up here instead.
+_ENUM_VALUES: dict[Any, str] = {
+    member: member.value for enum in (AnomalyType, Severity) for member in enum
+}
 
-@dataclass
+
+@dataclass(slots=True)
 class ThresholdConfig:
     """Configuration for anomaly detection thresholds."""
     error_rate: float = 0.05  # 5%
@@ -94,7 +81,33 @@ class AnomalyDetector:
         anomalies = detector.detect_anomalies(metrics)
     """
     
-    def __init__(self, settings):
+    # Severity bins as (ascending cut points, severities). A value lands in
+    # bin bisect_right(cut_points, value), so each cut point is inclusive.
+    # Error rate and latency are binned on the value/threshold ratio...
+    RATIO_SEVERITY_TABLES: ClassVar[dict] = {
+        # Error rates: 2x threshold (e.g. 10% at 5%) is high, 4x is critical
+        AnomalyType.ERROR_RATE_SPIKE: (
+            (2.0, 4.0),
+            (Severity.MEDIUM, Severity.HIGH, Severity.CRITICAL),
+        ),
+        AnomalyType.LATENCY_SPIKE: (
+            (2.0, 3.0),
+            (Severity.LOW, Severity.MEDIUM, Severity.HIGH),
+        ),
+    }
+    # ...while resource usage is binned on the absolute percentage.
+    VALUE_SEVERITY_TABLES: ClassVar[dict] = {
+        AnomalyType.CPU_OVERLOAD: (
+            (90.0, 95.0),
+            (Severity.MEDIUM, Severity.HIGH, Severity.CRITICAL),
+        ),
+        AnomalyType.MEMORY_OVERLOAD: (
+            (90.0, 95.0),
+            (Severity.MEDIUM, Severity.HIGH, Severity.CRITICAL),
+        ),
+    }
+    
+    def __init__(self, settings: Any) -> None:
         """
         Initialize the anomaly detector.
         
@@ -109,9 +122,53 @@ class AnomalyDetector:
             memory_percent=getattr(settings, 'anomaly_threshold_memory_percent', 85),
         )
         
-        # Track recent anomalies for deduplication
-        self._recent_anomalies: dict[str, datetime] = {}
+        # Track recent anomalies for deduplication. Hot keys live in a small
+        # direct-mapped cache of (key, monotonic time) slots; keys displaced
+        # by a slot collision are written back to the dict.
+        self._cooldown_cache: list[tuple[Optional[str], float]] = (
+            [(None, 0.0)] * COOLDOWN_CACHE_SLOTS
+        )
+        self._recent_anomalies: dict[str, float] = {}
+        # Min-heap of (expiry, key) for dict entries, so expired keys are
+        # purged without scanning the dict
+        self._cooldown_expiry: list[tuple[float, str]] = []
         self._cooldown_seconds = getattr(settings, 'alert_cooldown_seconds', 60)
+        
+        # Thresholds are read through providers so update_thresholds
+        # takes effect without rebuilding the checkers below
+        self._threshold_providers: dict[MetricType, Callable[[], float]] = {
+            MetricType.ERROR_RATE: lambda: self.thresholds.error_rate,
+            MetricType.LATENCY_P99: lambda: self.thresholds.latency_p99_ms,
+            MetricType.LATENCY_P95: lambda: self.thresholds.latency_p95_ms,
+            MetricType.CPU_USAGE: lambda: self.thresholds.cpu_percent,
+            MetricType.MEMORY_USAGE: lambda: self.thresholds.memory_percent,
+            MetricType.POD_RESTART_COUNT: lambda: self.thresholds.pod_restart_count,
+        }
+        
+        # One checker per metric type, dispatched by hash lookup
+        self._dispatch: dict[MetricType, Callable[[MetricValue], Optional[Violation]]] = {
+            MetricType.ERROR_RATE: self._make_checker(
+                MetricType.ERROR_RATE, AnomalyType.ERROR_RATE_SPIKE, "error_rate",
+                lambda metric: {"labels": metric.labels}
+            ),
+            MetricType.LATENCY_P99: self._make_checker(
+                MetricType.LATENCY_P99, AnomalyType.LATENCY_SPIKE, "latency_p99_ms",
+                lambda metric: {"percentile": "p99"}
+            ),
+            MetricType.LATENCY_P95: self._make_checker(
+                MetricType.LATENCY_P95, AnomalyType.LATENCY_SPIKE, "latency_p95_ms",
+                lambda metric: {"percentile": "p95"}
+            ),
+            MetricType.CPU_USAGE: self._make_checker(
+                MetricType.CPU_USAGE, AnomalyType.CPU_OVERLOAD, "cpu_percent"
+            ),
+            MetricType.MEMORY_USAGE: self._make_checker(
+                MetricType.MEMORY_USAGE, AnomalyType.MEMORY_OVERLOAD, "memory_percent"
+            ),
+            MetricType.POD_RESTART_COUNT: self._make_checker(
+                MetricType.POD_RESTART_COUNT, AnomalyType.POD_CRASH_LOOP, "pod_restart_count"
+            ),
+        }
     
     def update_thresholds(
         self,
@@ -154,21 +211,68 @@ class AnomalyDetector:
         anomaly_type: AnomalyType
     ) -> str:
         """Generate a unique key for anomaly deduplication."""
-        return f"{namespace}:{service}:{anomaly_type.value}"
+        return f"{namespace}:{service}:{_ENUM_VALUES[anomaly_type]}"
     
     def _is_in_cooldown(self, anomaly_key: str) -> bool:
         """Check if an anomaly is in cooldown period."""
-        if anomaly_key not in self._recent_anomalies:
-            return False
+        now = time.monotonic()
+        slot = hash(anomaly_key) & (COOLDOWN_CACHE_SLOTS - 1)
+        cached_key, last_time = self._cooldown_cache[slot]
         
-        last_time = self._recent_anomalies[anomaly_key]
-        elapsed = (datetime.utcnow() - last_time).total_seconds()
+        if cached_key == anomaly_key:
+            if now - last_time < self._cooldown_seconds:
+                return True
+            # Expired: free the slot
+            self._cooldown_cache[slot] = (None, 0.0)
+            return False
         
-        return elapsed < self._cooldown_seconds
+        recorded: Optional[float] = self._recent_anomalies.get(anomaly_key)
+        if recorded is None:
+            return False
+        if now - recorded < self._cooldown_seconds:
+            return True
+        del self._recent_anomalies[anomaly_key]
+        return False
     
     def _record_anomaly(self, anomaly_key: str) -> None:
         """Record an anomaly for cooldown tracking."""
-        self._recent_anomalies[anomaly_key] = datetime.utcnow()
+        slot = hash(anomaly_key) & (COOLDOWN_CACHE_SLOTS - 1)
+        cached_key, last_time = self._cooldown_cache[slot]
+        
+        if cached_key is not None and cached_key != anomaly_key:
+            self._recent_anomalies[cached_key] = last_time
+            heappush(
+                self._cooldown_expiry,
+                (last_time + self._cooldown_seconds, cached_key)
+            )
+        
+        self._cooldown_cache[slot] = (anomaly_key, time.monotonic())
+        # A key lives either in the cache or in the dict, never both
+        self._recent_anomalies.pop(anomaly_key, None)
+    
+    def _expire_cooldowns(self) -> None:
+        """Drop dict-tracked cooldowns that have expired."""
+        now = time.monotonic()
+        expiry = self._cooldown_expiry
+        
+        while expiry and expiry[0][0] <= now:
+            _, anomaly_key = heappop(expiry)
+            last_time = self._recent_anomalies.get(anomaly_key)
+            # The key may have been refreshed or moved back into the cache
+            if last_time is not None and last_time + self._cooldown_seconds <= now:
+                del self._recent_anomalies[anomaly_key]
+    
+    def _metric_type_limits(self) -> dict[MetricType, float]:
+        """
+        Map each checked metric type to the threshold it must exceed.
+        
+        Metric types without a check are absent. Built per detection pass
+        so threshold updates take effect immediately.
+        """
+        return {
+            metric_type: threshold()
+            for metric_type, threshold in self._threshold_providers.items()
+        }
     
     def _determine_severity(
         self,
@@ -187,37 +291,19 @@ class AnomalyDetector:
         Returns:
             Calculated severity level
         """
-        if threshold_value == 0:
-            ratio = float('inf')
-        else:
-            ratio = current_value / threshold_value
+        table = self.VALUE_SEVERITY_TABLES.get(anomaly_type)
+        if table is not None:
+            cut_points, severities = table
+            return severities[bisect_right(cut_points, current_value)]
         
-        # Error rates are critical if over 20%, high if over 10%
-        if anomaly_type == AnomalyType.ERROR_RATE_SPIKE:
-            if ratio >= 4:  # 4x threshold (e.g., 20% if threshold is 5%)
-                return Severity.CRITICAL
-            elif ratio >= 2:  # 2x threshold (e.g., 10% if threshold is 5%)
-                return Severity.HIGH
+        table = self.RATIO_SEVERITY_TABLES.get(anomaly_type)
+        if table is not None:
+            if threshold_value == 0:
+                ratio = float('inf')
             else:
-                return Severity.MEDIUM
-        
-        # Latency severity based on multiplier
-        if anomaly_type == AnomalyType.LATENCY_SPIKE:
-            if ratio >= 3:
-                return Severity.HIGH
-            elif ratio >= 2:
-                return Severity.MEDIUM
-            else:
-                return Severity.LOW
-        
-        # Resource usage severity
-        if anomaly_type in (AnomalyType.CPU_OVERLOAD, AnomalyType.MEMORY_OVERLOAD):
-            if current_value >= 95:
-                return Severity.CRITICAL
-            elif current_value >= 90:
-                return Severity.HIGH
-            else:
-                return Severity.MEDIUM
+                ratio = current_value / threshold_value
+            cut_points, severities = table
+            return severities[bisect_right(cut_points, ratio)]
         
         return Severity.MEDIUM
     
@@ -229,16 +315,24 @@ class AnomalyDetector:
         metric_name: str,
         current_value: float,
         threshold_value: float,
-        additional_context: Optional[dict] = None
+        additional_context: Optional[dict] = None,
+        timestamp: Optional[datetime] = None
     ) -> AnomalyEvent:
-        """Create an AnomalyEvent object."""
+        """
+        Create an AnomalyEvent object.
+        
+        Args:
+            timestamp: Detection time; callers creating many events in one
+                pass should snapshot it once and pass it in
+        """
         severity = self._determine_severity(
             anomaly_type, current_value, threshold_value
         )
         
         return AnomalyEvent(
-            event_id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
+            # 128 random bits as hex, without building a UUID object
+            event_id=urandom(16).hex(),
+            timestamp=timestamp or datetime.utcnow(),
             source_service="monitoring",
             correlation_id=None,
             anomaly_type=anomaly_type,
@@ -261,7 +355,8 @@ class AnomalyDetector:
         Detect anomalies in the provided metrics.
         
         Iterates through all metrics and compares against thresholds.
-        Applies cooldown to prevent duplicate alerts.
+        Applies cooldown to prevent duplicate alerts; events are only
+        built for violations that are not in cooldown.
         
         Args:
             service_metrics: List of ServiceMetrics to analyze
@@ -270,135 +365,128 @@ class AnomalyDetector:
             List of detected AnomalyEvent objects
         """
         anomalies: list[AnomalyEvent] = []
+        summaries: list[dict] = []
+        now = datetime.utcnow()
+        limits = self._metric_type_limits()
+        self._expire_cooldowns()
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         
-        for service in service_metrics:
-            for metric in service.metrics:
-                detected = self._check_metric(
-                    metric,
-                    service.service_name,
-                    service.namespace
-                )
-                
-                if detected:
-                    # Check cooldown
-                    anomaly_key = self._generate_anomaly_key(
-                        service.service_name,
-                        service.namespace,
-                        detected.anomaly_type
+        # Threshold scan in a single comprehension; most metrics are healthy
+        # and only the survivors go through the full check below
+        limit_for = limits.get
+        inf = math.inf
+        exceeding = [
+            (service, metric)
+            for service in service_metrics
+            for metric in service.metrics
+            if metric.value > limit_for(metric.metric_type, inf)
+        ]
+        
+        for service, metric in exceeding:
+            violation = self._check_metric(metric)
+            if violation is None:
+                continue
+            
+            # Check cooldown before paying for event construction
+            anomaly_type = violation[0]
+            anomaly_key = self._generate_anomaly_key(
+                service.service_name,
+                service.namespace,
+                anomaly_type
+            )
+            
+            if self._is_in_cooldown(anomaly_key):
+                if debug_enabled:
+                    logger.debug(
+                        f"Anomaly in cooldown: {anomaly_key}"
                     )
-                    
-                    if not self._is_in_cooldown(anomaly_key):
-                        anomalies.append(detected)
-                        self._record_anomaly(anomaly_key)
-                        
-                        logger.info(
-                            f"Anomaly detected: {detected.anomaly_type.value}",
-                            extra={
-                                "service": service.service_name,
-                                "namespace": service.namespace,
-                                "metric": detected.metric_name,
-                                "value": detected.current_value,
-                                "threshold": detected.threshold_value,
-                                "severity": detected.severity.value
-                            }
-                        )
-                    else:
-                        logger.debug(
-                            f"Anomaly in cooldown: {anomaly_key}"
-                        )
+                continue
+            
+            anomaly_type, metric_name, current_value, threshold_value, context = violation
+            detected = self._create_anomaly_event(
+                anomaly_type=anomaly_type,
+                service_name=service.service_name,
+                namespace=service.namespace,
+                metric_name=metric_name,
+                current_value=current_value,
+                threshold_value=threshold_value,
+                additional_context=context,
+                timestamp=now
+            )
+            anomalies.append(detected)
+            self._record_anomaly(anomaly_key)
+            
+            summary = {
+                "type": _ENUM_VALUES[detected.anomaly_type],
+                "service": service.service_name,
+                "namespace": service.namespace,
+                "metric": detected.metric_name,
+                "value": detected.current_value,
+                "threshold": detected.threshold_value,
+                "severity": _ENUM_VALUES[detected.severity]
+            }
+            summaries.append(summary)
+            
+            if debug_enabled:
+                logger.debug(
+                    f"Anomaly detected: {summary['type']}",
+                    extra=summary
+                )
+        
+        # One record per pass instead of one per anomaly
+        if summaries:
+            logger.info(
+                f"Detected {len(summaries)} anomalies",
+                extra={"anomalies": summaries}
+            )
         
         return anomalies
     
-    def _check_metric(
+    def _make_checker(
         self,
-        metric: MetricValue,
-        service_name: str,
-        namespace: str
-    ) -> Optional[AnomalyEvent]:
+        metric_type: MetricType,
+        anomaly_type: AnomalyType,
+        metric_name: str,
+        context: Optional[Callable[[MetricValue], dict]] = None
+    ) -> Callable[[MetricValue], Optional[Violation]]:
         """
-        Check a single metric against thresholds.
+        Build the threshold check for one metric type.
         
         Args:
-            metric: The metric to check
-            service_name: Name of the service
-            namespace: Kubernetes namespace
+            metric_type: Metric type whose threshold provider to use
+            anomaly_type: Anomaly reported when the threshold is exceeded
+            metric_name: Metric name reported in the event
+            context: Optional builder for the event's additional context
             
         Returns:
-            AnomalyEvent if threshold exceeded, None otherwise
+            Function returning a Violation if the metric exceeds its
+            threshold, None otherwise
         """
-        # Error rate check
-        if metric.metric_type == MetricType.ERROR_RATE:
-            if metric.value > self.thresholds.error_rate:
-                return self._create_anomaly_event(
-                    anomaly_type=AnomalyType.ERROR_RATE_SPIKE,
-                    service_name=service_name,
-                    namespace=namespace,
-                    metric_name="error_rate",
-                    current_value=metric.value,
-                    threshold_value=self.thresholds.error_rate,
-                    additional_context={"labels": metric.labels}
-                )
+        threshold = self._threshold_providers[metric_type]
         
-        # P99 latency check
-        elif metric.metric_type == MetricType.LATENCY_P99:
-            if metric.value > self.thresholds.latency_p99_ms:
-                return self._create_anomaly_event(
-                    anomaly_type=AnomalyType.LATENCY_SPIKE,
-                    service_name=service_name,
-                    namespace=namespace,
-                    metric_name="latency_p99_ms",
-                    current_value=metric.value,
-                    threshold_value=self.thresholds.latency_p99_ms,
-                    additional_context={"percentile": "p99"}
+        def check(metric: MetricValue) -> Optional[Violation]:
+            limit = threshold()
+            if metric.value > limit:
+                return (
+                    anomaly_type,
+                    metric_name,
+                    metric.value,
+                    limit,
+                    context(metric) if context else None
                 )
+            return None
         
-        # P95 latency check
-        elif metric.metric_type == MetricType.LATENCY_P95:
-            if metric.value > self.thresholds.latency_p95_ms:
-                return self._create_anomaly_event(
-                    anomaly_type=AnomalyType.LATENCY_SPIKE,
-                    service_name=service_name,
-                    namespace=namespace,
-                    metric_name="latency_p95_ms",
-                    current_value=metric.value,
-                    threshold_value=self.thresholds.latency_p95_ms,
-                    additional_context={"percentile": "p95"}
-                )
-        
-        # CPU usage check
-        elif metric.metric_type == MetricType.CPU_USAGE:
-            if metric.value > self.thresholds.cpu_percent:
-                return self._create_anomaly_event(
-                    anomaly_type=AnomalyType.CPU_OVERLOAD,
-                    service_name=service_name,
-                    namespace=namespace,
-                    metric_name="cpu_percent",
-                    current_value=metric.value,
-                    threshold_value=self.thresholds.cpu_percent
-                )
-        
-        # Memory usage check
-        elif metric.metric_type == MetricType.MEMORY_USAGE:
-            if metric.value > self.thresholds.memory_percent:
-                return self._create_anomaly_event(
-                    anomaly_type=AnomalyType.MEMORY_OVERLOAD,
-                    service_name=service_name,
-                    namespace=namespace,
-                    metric_name="memory_percent",
-                    current_value=metric.value,
-                    threshold_value=self.thresholds.memory_percent
-                )
-        
-        # Pod restart check
-        elif metric.metric_type == MetricType.POD_RESTART_COUNT:
-            if metric.value > self.thresholds.pod_restart_count:
-                return self._create_anomaly_event(
-                    anomaly_type=AnomalyType.POD_CRASH_LOOP,
-                    service_name=service_name,
-                    namespace=namespace,
-                    metric_name="pod_restart_count",
-                    current_value=metric.value,
-                    threshold_value=self.thresholds.pod_restart_count
-                )
+        return check
+    
+    def _check_metric(self, metric: MetricValue) -> Optional[Violation]:
+        """
+        Check a single metric against thresholds.
         
-        return None
+        Args:
+            metric: The metric to check
+            
+        Returns:
+            Violation if the threshold is exceeded, None otherwise
+        """
+        check = self._dispatch.get(metric.metric_type)
+        return check(metric) if check else None
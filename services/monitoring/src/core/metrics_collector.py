@@ -10,9 +10,22 @@ Supports common infrastructure and application metrics:
 - Pod restart counts
 """
 
+import asyncio
+from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
+import math
+import re
+import sys
 import httpx
+import orjson
+
+# Optional SIMD JSON parser for large query responses
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
 
 # Try to import shared logging
 try:
@@ -27,6 +40,95 @@ from src.api.schemas import ServiceMetrics, MetricValue, MetricType
 logger = get_logger(__name__)
 
 
+# Label that identifies the workload for each raw metric used in QUERIES.
+# Application metrics carry a `service` label; cAdvisor/kube-state-metrics
+# series are per pod.
+_SERVICE_LABELS = {
+    "http_requests_total": "service",
+    "http_request_duration_seconds_bucket": "service",
+    "container_cpu_usage_seconds_total": "pod",
+    "container_spec_cpu_quota": "pod",
+    "container_spec_cpu_period": "pod",
+    "container_memory_usage_bytes": "pod",
+    "container_spec_memory_limit_bytes": "pod",
+    "kube_pod_container_status_restarts_total": "pod",
+}
+
+# Matches a metric name plus its optional `{...}` selector
+_SELECTOR_PATTERN = re.compile(
+    r"\b(" + "|".join(_SERVICE_LABELS) + r")\b(?:\{([^}]*)\})?"
+)
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape a value for use inside a double-quoted PromQL string."""
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+@lru_cache(maxsize=1024)
+def _filter_query(query: str, service: str, namespace: str) -> str:
+    """
+    Restrict a PromQL query to a single service and namespace.
+    
+    Adds label matchers to every metric selector in the query so that
+    Prometheus only returns the relevant series. The service is matched as
+    a substring of the `service` or `pod` label (pods carry a generated
+    suffix), the namespace exactly. Results are cached, since the same
+    services are queried repeatedly.
+    
+    Args:
+        query: PromQL query built from the metrics in _SERVICE_LABELS
+        service: Service name to match
+        namespace: Kubernetes namespace to match
+        
+    Returns:
+        The query with label matchers injected
+    """
+    service_regex = _escape_label_value(f".*{re.escape(service)}.*")
+    namespace_value = _escape_label_value(namespace)
+    
+    def add_matchers(match: re.Match) -> str:
+        metric, existing = match.group(1), match.group(2)
+        matchers = (
+            f'{_SERVICE_LABELS[metric]}=~"{service_regex}", '
+            f'namespace="{namespace_value}"'
+        )
+        if existing:
+            matchers = f"{existing}, {matchers}"
+        return f"{metric}{{{matchers}}}"
+    
+    return _SELECTOR_PATTERN.sub(add_matchers, query)
+
+
+def _decode_query_response(content: bytes) -> tuple[Optional[str], list[dict]]:
+    """
+    Decode a Prometheus /api/v1/query response body.
+    
+    With pysimdjson installed, the document is parsed lazily and only the
+    `data.result` array is materialized as Python objects; otherwise the
+    whole body is decoded with orjson.
+    
+    Args:
+        content: Raw response body
+        
+    Returns:
+        Tuple of (status, result list); the list is empty unless the
+        status is "success"
+    """
+    if simdjson is not None:
+        document = simdjson.Parser().parse(content)
+        status = document.get("status")
+        if status != "success":
+            return status, []
+        return status, document.at_pointer("/data/result").as_list()
+    
+    data = orjson.loads(content)
+    status = data.get("status")
+    if status != "success":
+        return status, []
+    return status, data.get("data", {}).get("result", [])
+
+
 class MetricsCollector:
     """
     Collects metrics from Prometheus.
@@ -81,23 +183,43 @@ class MetricsCollector:
         """,
     }
     
-    def __init__(self, prometheus_url: str, timeout_seconds: float = 10.0):
+    def __init__(
+        self,
+        prometheus_url: str,
+        timeout_seconds: float = 10.0,
+        client: httpx.AsyncClient | None = None
+    ):
         """
         Initialize the metrics collector.
         
         Args:
             prometheus_url: Base URL of the Prometheus server
             timeout_seconds: HTTP request timeout
+            client: Application-owned HTTP client to reuse; when given,
+                close() leaves it open for its owner to close
         """
         self.prometheus_url = prometheus_url.rstrip("/")
         self.timeout = timeout_seconds
-        self._client: httpx.AsyncClient | None = None
+        self._client: httpx.AsyncClient | None = client
+        self._owns_client = client is None
     
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create an HTTP client."""
+        """
+        Get or create the shared HTTP client.
+        
+        A single HTTP/2 client is reused for health checks and all PromQL
+        queries, so concurrent queries are multiplexed over one kept-alive
+        connection instead of paying a TCP handshake each.
+        """
         if self._client is None:
             self._client = httpx.AsyncClient(
-                timeout=httpx.Timeout(self.timeout)
+                http2=True,
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_keepalive_connections=20,
+                    max_connections=50,
+                    keepalive_expiry=60.0
+                )
             )
         return self._client
     
@@ -121,7 +243,8 @@ class MetricsCollector:
         Execute a PromQL query against Prometheus.
         
         Args:
-            query: PromQL query string
+            query: PromQL query string (leading/trailing whitespace is
+                not stripped here; see _STRIPPED_QUERIES)
             
         Returns:
             List of result dictionaries from Prometheus
@@ -129,19 +252,21 @@ class MetricsCollector:
         client = await self._get_client()
         
         try:
-            response = await client.get(
+            # POST keeps long PromQL out of the URL; Prometheus accepts
+            # form-encoded queries on the same endpoint.
+            response = await client.post(
                 f"{self.prometheus_url}/api/v1/query",
-                params={"query": query.strip()}
+                data={"query": query}
             )
             response.raise_for_status()
             
-            data = response.json()
+            status, results = _decode_query_response(response.content)
             
-            if data.get("status") != "success":
-                logger.warning(f"Prometheus query failed: {data}")
+            if status != "success":
+                logger.warning(f"Prometheus query failed: status={status}")
                 return []
             
-            return data.get("data", {}).get("result", [])
+            return results
             
         except httpx.HTTPError as e:
             logger.error(f"HTTP error querying Prometheus: {e}")
@@ -166,28 +291,30 @@ class MetricsCollector:
             List of parsed MetricValue objects
         """
         metric_values = []
+        # One timestamp per batch: every row of an instant query shares it
+        now = datetime.utcnow()
+        # Local bindings avoid a global lookup per row
+        _float = float
+        _isfinite = math.isfinite
         
         for result in results:
             try:
-                # Extract labels
-                labels = result.get("metric", {})
+                # Instant queries always return {"metric": {...}, "value": [ts, "v"]}
+                labels = result["metric"]
+                _, raw_value = result["value"]
+                value = _float(raw_value)
                 
-                # Extract value (instant query returns [timestamp, value])
-                value_data = result.get("value", [])
-                if len(value_data) >= 2:
-                    value = float(value_data[1])
-                    
-                    # Skip NaN or infinite values
-                    if value != value or abs(value) == float("inf"):
-                        continue
-                    
-                    metric_values.append(MetricValue(
-                        metric_type=metric_type,
-                        value=value,
-                        labels=labels,
-                        timestamp=datetime.utcnow()
-                    ))
-            except (ValueError, IndexError, KeyError) as e:
+                # Skip NaN or infinite values
+                if not _isfinite(value):
+                    continue
+                
+                metric_values.append(MetricValue(
+                    metric_type=metric_type,
+                    value=value,
+                    labels=labels,
+                    timestamp=now
+                ))
+            except (ValueError, TypeError, KeyError) as e:
                 logger.debug(f"Failed to parse result: {result}, error: {e}")
                 continue
         
@@ -203,7 +330,7 @@ class MetricsCollector:
         Returns:
             List of MetricValue objects
         """
-        query = self.QUERIES.get(metric_type)
+        query = _STRIPPED_QUERIES.get(metric_type)
         if not query:
             logger.warning(f"No query defined for metric type: {metric_type}")
             return []
@@ -215,28 +342,34 @@ class MetricsCollector:
         """
         Collect all metric types and group by service.
         
+        All queries are issued concurrently over the shared client, so a
+        poll cycle costs one round-trip instead of one per metric type.
+        
         Returns:
             List of ServiceMetrics, one per unique service/namespace
         """
-        all_metrics: dict[tuple[str, str], list[MetricValue]] = {}
+        all_metrics: defaultdict[tuple[str, str], list[MetricValue]] = defaultdict(list)
+        
+        # query_prometheus turns request errors into empty results, so a
+        # failing query cannot abort the others (and cancellation still
+        # propagates)
+        collected = await asyncio.gather(
+            *(self.query_prometheus(query) for _, query in _QUERY_PLAN)
+        )
         
-        for metric_type in MetricType:
+        for (metric_type, _), results in zip(_QUERY_PLAN, collected):
             try:
-                metrics = await self.collect_metric(metric_type)
-                
-                for metric in metrics:
-                    # Group by service and namespace
-                    service = metric.labels.get("service") or metric.labels.get("pod", "unknown")
-                    namespace = metric.labels.get("namespace", "default")
-                    key = (service, namespace)
-                    
-                    if key not in all_metrics:
-                        all_metrics[key] = []
-                    all_metrics[key].append(metric)
-                    
+                metrics = self._parse_prometheus_result(results, metric_type)
             except Exception as e:
                 logger.error(f"Error collecting {metric_type}: {e}")
                 continue
+
+            for metric in metrics:
+                # Group by service and namespace. Interned names make
+                # repeated key comparisons identity checks.
+                service = metric.labels.get("service") or metric.labels.get("pod", "unknown")
+                namespace = metric.labels.get("namespace", "default")
+                all_metrics[(sys.intern(service), sys.intern(namespace))].append(metric)
         
         # Convert to ServiceMetrics objects
         result = []
@@ -270,32 +403,26 @@ class MetricsCollector:
             ServiceMetrics for the specified service
         """
         metrics = []
-        types_to_collect = (
-            [MetricType(mt) for mt in metric_types]
-            if metric_types
-            else list(MetricType)
-        )
+        types_to_collect = [
+            metric_type
+            for metric_type in (
+                [MetricType(mt) for mt in metric_types]
+                if metric_types
+                else list(MetricType)
+            )
+            if _STRIPPED_QUERIES.get(metric_type)
+        ]
         
-        for metric_type in types_to_collect:
-            query = self.QUERIES.get(metric_type, "")
-            if not query:
-                continue
-            
-            # Add service filter to query
-            # Note: This is a simplified filter - in production, use proper PromQL
-            filtered_query = query
-            
-            results = await self.query_prometheus(filtered_query)
-            
-            # Filter results by service name
-            for result in results:
-                labels = result.get("metric", {})
-                result_service = labels.get("service") or labels.get("pod", "")
-                result_namespace = labels.get("namespace", "default")
-                
-                if service_name in result_service and namespace == result_namespace:
-                    parsed = self._parse_prometheus_result([result], metric_type)
-                    metrics.extend(parsed)
+        # Filter server-side so only this service's series are returned
+        results = await asyncio.gather(*(
+            self.query_prometheus(
+                _filter_query(_STRIPPED_QUERIES[metric_type], service_name, namespace)
+            )
+            for metric_type in types_to_collect
+        ))
+        
+        for metric_type, result in zip(types_to_collect, results):
+            metrics.extend(self._parse_prometheus_result(result, metric_type))
         
         return ServiceMetrics(
             service_name=service_name,
@@ -305,7 +432,22 @@ class MetricsCollector:
         )
     
     async def close(self) -> None:
-        """Close the HTTP client."""
-        if self._client:
+        """Close the HTTP client if this collector created it."""
+        if self._client and self._owns_client:
             await self._client.aclose()
-            self._client = None
+        self._client = None
+
+
+# QUERIES is a class constant, so strip the multi-line PromQL once at import
+# instead of on every request.
+_STRIPPED_QUERIES: dict[MetricType, str] = {
+    metric_type: query.strip()
+    for metric_type, query in MetricsCollector.QUERIES.items()
+}
+
+# Every query a full collection pass issues, in MetricType order
+_QUERY_PLAN: tuple[tuple[MetricType, str], ...] = tuple(
+    (metric_type, _STRIPPED_QUERIES[metric_type])
+    for metric_type in MetricType
+    if _STRIPPED_QUERIES.get(metric_type)
+)
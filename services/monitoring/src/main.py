@@ -13,12 +13,20 @@ Responsibilities:
 """
 
 import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+import httpx
+import orjson
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, generate_latest
 import uuid
 
 # Local imports
@@ -28,12 +36,17 @@ from src.api.routes import router as api_router
 # Import shared utilities - handle case where shared might not be available
 try:
     from shared.utils.logging import setup_logging, get_logger, set_correlation_id
+    from shared.utils.http_client import close_all_clients
 except ImportError:
     # Fallback for when shared module is not in path
-    import logging
     import sys
     
-    def setup_logging(service_name: str, log_level: str = "INFO", json_output: bool = True):
+    def setup_logging(
+        service_name: str,
+        log_level: str = "INFO",
+        json_output: bool = True,
+        binary_output: bool = False
+    ):
         logging.basicConfig(
             level=getattr(logging, log_level),
             format=f"%(asctime)s | {service_name} | %(levelname)s | %(name)s | %(message)s",
@@ -45,6 +58,9 @@ except ImportError:
     
     def set_correlation_id(cid: str):
         pass
+    
+    async def close_all_clients():
+        pass
 
 
 settings = get_settings()
@@ -53,66 +69,265 @@ settings = get_settings()
 setup_logging(
     service_name=settings.service_name,
     log_level=settings.log_level,
-    json_output=settings.log_json
+    json_output=settings.log_json,
+    binary_output=settings.log_binary
 )
 
 logger = get_logger(__name__)
 
+_DEBUG = settings.debug
+
 
 # Background task reference
 _polling_task: asyncio.Task | None = None
 
+# Set on shutdown; the polling loop exits at its next cycle boundary
+_stop_event = asyncio.Event()
+
+# Probe and scrape endpoints bypass correlation tracking; /health never
+# changes, so its body is encoded once
+_UNTRACKED_PATHS = frozenset({"/health", "/ready", "/metrics"})
+_HEALTH_METHODS = frozenset({"GET", "HEAD"})
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": settings.service_name,
+    "version": settings.service_version
+})
+
+# Polling loop metrics, exposed on /metrics
+POLLS_TOTAL = Counter(
+    "autoheal_monitoring_polls",
+    "Metric poll cycles run"
+)
+POLLS_UNCHANGED_TOTAL = Counter(
+    "autoheal_monitoring_polls_unchanged",
+    "Poll cycles that found no new samples in Prometheus"
+)
+POLL_ERRORS_TOTAL = Counter(
+    "autoheal_monitoring_poll_errors",
+    "Poll cycles that failed"
+)
+ANOMALIES_DETECTED_TOTAL = Counter(
+    "autoheal_monitoring_anomalies_detected",
+    "Anomalies detected across all poll cycles"
+)
+LAST_POLL_DURATION_SECONDS = Gauge(
+    "autoheal_monitoring_last_poll_duration_seconds",
+    "Duration of the most recent poll cycle"
+)
+
+# Pre-generated correlation IDs, refilled from one urandom call per 1024 IDs
+_UUID_POOL_SIZE = 1024
+_UUID_POOL: deque[str] = deque()
+
+
+def _refill_uuid_pool() -> None:
+    """Generate a block of random (version 4) UUID strings into the pool."""
+    raw = os.urandom(16 * _UUID_POOL_SIZE)
+    _UUID_POOL.extend(
+        str(uuid.UUID(bytes=raw[i:i + 16], version=4))
+        for i in range(0, len(raw), 16)
+    )
+
+
+def _next_correlation_id() -> str:
+    """Take a fresh correlation ID from the pool."""
+    if not _UUID_POOL:
+        _refill_uuid_pool()
+    return _UUID_POOL.popleft()
+
+
+def _scrape_grid_point(
+    now: float,
+    wall_now: float,
+    scrape_interval: float,
+    scrape_offset: float
+) -> float:
+    """
+    Find the most recent poll slot on the scrape grid.
+    
+    Poll slots sit `scrape_offset` after each wall-clock scrape boundary.
+    The slot is located once from the wall clock and returned on the
+    monotonic clock `now` is read from, so the schedule built on it is
+    unaffected by later wall-clock adjustments.
+    
+    Args:
+        now: Current monotonic time (loop.time())
+        wall_now: Current wall-clock time, read alongside `now`
+        scrape_interval: Prometheus scrape interval
+        scrape_offset: Delay after each scrape boundary
+        
+    Returns:
+        Monotonic time of the slot at or before `now`
+    """
+    wall_slot = (
+        math.floor((wall_now - scrape_offset) / scrape_interval) * scrape_interval
+        + scrape_offset
+    )
+    return now - (wall_now - wall_slot)
+
 
-async def start_metric_polling():
+def _next_poll_time(
+    scheduled: float,
+    now: float,
+    min_interval: float,
+    scrape_interval: float
+) -> float:
+    """
+    Compute when the poll after the one scheduled at `scheduled` is due.
+    
+    Polls advance from slot to slot by `min_interval` rounded up to whole
+    scrape intervals. Stepping from the scheduled slot rather than from
+    when the cycle actually started means a timer that fires slightly
+    early cannot schedule the same slot twice; a cycle that overran is
+    moved to the first slot after `now` instead of polling back to back.
+    
+    Args:
+        scheduled: Monotonic time the current poll was scheduled for
+        now: Current monotonic time (loop.time())
+        min_interval: Polling interval, rounded up to whole scrape intervals
+        scrape_interval: Prometheus scrape interval
+        
+    Returns:
+        Monotonic time of the next poll
+    """
+    next_poll = scheduled + math.ceil(min_interval / scrape_interval) * scrape_interval
+    if next_poll < now:
+        next_poll += math.ceil((now - next_poll) / scrape_interval) * scrape_interval
+    return next_poll
+
+
+def _metrics_fingerprint(metrics: list) -> int:
+    """
+    Fingerprint collected metric values.
+    
+    Instant queries are stamped with the evaluation time, so an unchanged
+    fingerprint is how we tell that Prometheus has not ingested new samples.
+    """
+    return hash(tuple(
+        (service.service_name, service.namespace, metric.metric_type, metric.value)
+        for service in metrics
+        for metric in service.metrics
+    ))
+
+
+async def _poll_once(collector, detector, alerter, last_fingerprint: int | None) -> int | None:
+    """
+    Run one collect -> detect -> alert cycle.
+    
+    The stages depend on each other, so they run in sequence; alert
+    delivery itself is handed off to the alerter's batcher.
+    
+    Args:
+        collector: MetricsCollector to poll Prometheus with
+        detector: AnomalyDetector to run on the collected metrics
+        alerter: Alerter that anomalies are queued on for delivery
+        last_fingerprint: Fingerprint returned by the previous cycle
+        
+    Returns:
+        Fingerprint of this cycle's metrics (the previous one on error)
+    """
+    # Checked once per cycle so the debug lines below cost nothing at INFO
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    
+    try:
+        # Collect current metrics
+        metrics = await collector.collect_all_metrics()
+        
+        # Detection still runs on unchanged samples: a violation that is
+        # still present must alert again once its cooldown expires
+        fingerprint = _metrics_fingerprint(metrics)
+        if fingerprint == last_fingerprint:
+            if debug_enabled:
+                logger.debug("No new samples since last poll")
+            POLLS_UNCHANGED_TOTAL.inc()
+        
+        if metrics:
+            if debug_enabled:
+                logger.debug(
+                    f"Collected {len(metrics)} metrics",
+                    extra={"metric_count": len(metrics)}
+                )
+            
+            # Detect anomalies; the detector logs one INFO summary per pass
+            anomalies = detector.detect_anomalies(metrics)
+            ANOMALIES_DETECTED_TOTAL.inc(len(anomalies))
+            
+            if anomalies:
+                if debug_enabled:
+                    logger.debug(
+                        f"Queueing {len(anomalies)} anomalies for delivery",
+                        extra={"anomaly_count": len(anomalies)}
+                    )
+                
+                # Queue alerts for the batcher
+                await alerter.send_anomaly_events(anomalies)
+        
+        return fingerprint
+        
+    except Exception as e:
+        POLL_ERRORS_TOTAL.inc()
+        logger.error(
+            f"Error in metric polling loop: {e}",
+            extra={"error": str(e)}
+        )
+        return last_fingerprint
+
+
+async def start_metric_polling(collector, alerter):
     """
     Start the background metric polling loop.
     
     This coroutine runs continuously, polling Prometheus for metrics
-    and triggering anomaly detection on each poll cycle.
+    and triggering anomaly detection on each poll cycle. A single
+    long-lived task sleeping between cycles costs one timer entry per
+    cycle, no more than rescheduling through loop.call_later would.
+    
+    Args:
+        collector: MetricsCollector to poll Prometheus with
+        alerter: Alerter that anomalies are queued on for delivery
     """
-    from src.core.metrics_collector import MetricsCollector
     from src.core.anomaly_detector import AnomalyDetector
-    from src.core.alerter import Alerter
+    
+    # Settings are fixed for the process lifetime; bind them once
+    poll_interval = settings.polling_interval_seconds
+    scrape_interval = settings.prometheus_scrape_interval
+    scrape_offset = settings.prometheus_scrape_offset_seconds
     
     logger.info(
-        f"Starting metric polling with {settings.polling_interval_seconds}s interval"
+        f"Starting metric polling with {poll_interval}s interval"
     )
     
-    collector = MetricsCollector(settings.prometheus_url)
     detector = AnomalyDetector(settings)
-    alerter = Alerter(settings.incident_manager_url)
+    last_fingerprint: int | None = None
+    loop = asyncio.get_running_loop()
+    scheduled = _scrape_grid_point(
+        loop.time(), time.time(), scrape_interval, scrape_offset
+    )
     
-    while True:
+    while not _stop_event.is_set():
+        cycle_started = loop.time()
+        
+        last_fingerprint = await _poll_once(
+            collector, detector, alerter, last_fingerprint
+        )
+        
+        POLLS_TOTAL.inc()
+        now = loop.time()
+        LAST_POLL_DURATION_SECONDS.set(now - cycle_started)
+        
+        # Wait for the first scrape slot after the polling interval,
+        # waking early if shutdown is requested
+        scheduled = _next_poll_time(scheduled, now, poll_interval, scrape_interval)
         try:
-            # Collect current metrics
-            metrics = await collector.collect_all_metrics()
-            
-            if metrics:
-                logger.debug(
-                    f"Collected {len(metrics)} metrics",
-                    extra={"metric_count": len(metrics)}
-                )
-                
-                # Detect anomalies
-                anomalies = detector.detect_anomalies(metrics)
-                
-                if anomalies:
-                    logger.info(
-                        f"Detected {len(anomalies)} anomalies",
-                        extra={"anomaly_count": len(anomalies)}
-                    )
-                    
-                    # Send alerts
-                    await alerter.send_anomaly_events(anomalies)
-            
-        except Exception as e:
-            logger.error(
-                f"Error in metric polling loop: {e}",
-                extra={"error": str(e)}
+            await asyncio.wait_for(
+                _stop_event.wait(),
+                timeout=max(0.0, scheduled - now)
             )
-        
-        # Wait for next polling interval
-        await asyncio.sleep(settings.polling_interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+    
+    logger.info("Metric polling stopped")
 
 
 @asynccontextmanager
@@ -124,6 +339,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     - Startup: Initialize connections, start background tasks
     - Shutdown: Clean up resources, stop background tasks
     """
+    from src.core.metrics_collector import MetricsCollector
+    from src.core.alerter import Alerter
+    from src.api.routes import set_collector
+    
     global _polling_task
     
     logger.info(
@@ -131,9 +350,38 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         extra={"version": settings.service_version}
     )
     
+    # One pooled client per downstream for the whole process lifetime
+    limits = httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60.0)
+    app.state.prom_client = httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(settings.prometheus_timeout_seconds),
+        limits=limits
+    )
+    app.state.im_client = httpx.AsyncClient(
+        http2=True, timeout=httpx.Timeout(10.0), limits=limits
+    )
+    
+    collector = MetricsCollector(
+        settings.prometheus_url,
+        timeout_seconds=settings.prometheus_timeout_seconds,
+        client=app.state.prom_client
+    )
+    # API routes query through the same collector and connection pool
+    set_collector(collector)
+    alerter = Alerter(
+        settings.incident_manager_url,
+        max_batch_size=settings.alert_batch_size,
+        max_batch_delay_seconds=settings.alert_batch_delay_ms / 1000,
+        client=app.state.im_client
+    )
+    
     # Start metric polling if enabled
     if settings.polling_enabled:
-        _polling_task = asyncio.create_task(start_metric_polling())
+        alerter.start_batching()
+        _stop_event.clear()
+        _polling_task = asyncio.create_task(
+            start_metric_polling(collector, alerter)
+        )
         logger.info("Metric polling task started")
     else:
         logger.info("Metric polling is disabled")
@@ -143,12 +391,27 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     # Shutdown
     logger.info("Shutting down monitoring service...")
     
+    # Let an in-flight cycle finish instead of cancelling it mid-POST;
+    # wait_for cancels the task only if it overruns the grace period
     if _polling_task:
-        _polling_task.cancel()
+        _stop_event.set()
         try:
-            await _polling_task
-        except asyncio.CancelledError:
-            logger.info("Polling task cancelled")
+            await asyncio.wait_for(
+                _polling_task,
+                timeout=settings.polling_interval_seconds * 2
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Polling task did not stop in time and was cancelled")
+    
+    # Flush alerts queued by the final cycle
+    await alerter.stop_batching()
+    
+    set_collector(None)
+    await alerter.close()
+    await collector.close()
+    await app.state.im_client.aclose()
+    await app.state.prom_client.aclose()
+    await close_all_clients()
     
     logger.info("Monitoring service shutdown complete")
 
@@ -180,12 +443,26 @@ async def correlation_id_middleware(request: Request, call_next):
     Middleware to extract or generate correlation ID for tracing.
     
     The correlation ID is propagated through all service calls
-    to enable distributed tracing.
+    to enable distributed tracing. Probes and scrapes skip it: /health
+    probes are answered here directly, /ready and /metrics go straight
+    through. Only GET/HEAD requests without an Origin header take the
+    /health shortcut; anything else reaches the route through CORS.
     """
+    scope = request.scope
+    path = scope["path"]
+    if path in _UNTRACKED_PATHS:
+        if (
+            path == "/health"
+            and scope["method"] in _HEALTH_METHODS
+            and "origin" not in request.headers
+        ):
+            return Response(_HEALTH_BODY, media_type="application/json")
+        return await call_next(request)
+    
     # Get correlation ID from header or generate new one
     correlation_id = request.headers.get("X-Correlation-ID")
     if not correlation_id:
-        correlation_id = str(uuid.uuid4())
+        correlation_id = _next_correlation_id()
     
     # Set correlation ID in context
     set_correlation_id(correlation_id)
@@ -217,19 +494,20 @@ async def global_exception_handler(request: Request, exc: Exception):
         content={
             "error": "internal_server_error",
             "message": "An unexpected error occurred",
-            "detail": str(exc) if settings.debug else None
+            "detail": str(exc) if _DEBUG else None
         }
     )
 
 
 # Health check endpoint (at root level)
-@app.get("/health", tags=["health"])
+@app.get("/health", tags=["health"], include_in_schema=False)
 async def health_check():
     """
     Health check endpoint for container orchestration.
     
-    Returns service status and version information.
-    Used by Docker health checks and Kubernetes probes.
+    Returns service status and version information. Probes are answered
+    by correlation_id_middleware; this route serves cross-origin requests
+    so they get CORS headers.
     """
     return {
         "status": "healthy",
@@ -254,6 +532,20 @@ async def readiness_check():
     }
 
 
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Prometheus scrape endpoint for the monitoring service itself.
+    
+    Served uncompressed; scrapers decompress anyway, so gzip would only
+    burn CPU on every scrape. Not streamed either: generate_latest()
+    renders the whole registry (a few KB) into one bytes object, so a
+    StreamingResponse would send the same single chunk, minus the
+    Content-Length header.
+    """
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
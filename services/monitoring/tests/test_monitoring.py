@@ -5,6 +5,7 @@ AutoHeal AI - Monitoring Service Tests
 Unit tests for the monitoring service components.
 """
 
+import orjson
 import pytest
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -173,6 +174,72 @@ class TestAnomalyDetector:
         anomalies2 = detector.detect_anomalies(service_metrics)
         assert len(anomalies2) == 0
 
+    def test_cooldown_survives_cache_collisions(self, mock_settings):
+        """Test cooldown tracking for more keys than the cache has slots."""
+        from src.core.anomaly_detector import AnomalyDetector, COOLDOWN_CACHE_SLOTS
+
+        mock_settings.alert_cooldown_seconds = 300
+        detector = AnomalyDetector(mock_settings)
+        keys = [f"default:svc-{i}:error_rate_spike" for i in range(COOLDOWN_CACHE_SLOTS * 3)]
+
+        for key in keys:
+            assert not detector._is_in_cooldown(key)
+            detector._record_anomaly(key)
+
+        assert all(detector._is_in_cooldown(key) for key in keys)
+
+    def test_expired_cooldowns_are_purged(self, mock_settings):
+        """Test that expired cooldown entries do not accumulate."""
+        from src.core.anomaly_detector import AnomalyDetector, COOLDOWN_CACHE_SLOTS
+
+        mock_settings.alert_cooldown_seconds = 0
+        detector = AnomalyDetector(mock_settings)
+
+        for i in range(COOLDOWN_CACHE_SLOTS * 3):
+            detector._record_anomaly(f"default:svc-{i}:error_rate_spike")
+        detector.detect_anomalies([])
+
+        assert detector._recent_anomalies == {}
+        assert detector._cooldown_expiry == []
+
+    def test_severity_bins(self, mock_settings):
+        """Test severity levels at and around the bin boundaries."""
+        from src.core.anomaly_detector import AnomalyDetector, AnomalyType, Severity
+
+        detector = AnomalyDetector(mock_settings)
+
+        # Error rate is binned on the ratio to the threshold
+        assert detector._determine_severity(
+            AnomalyType.ERROR_RATE_SPIKE, 0.06, 0.05
+        ) == Severity.MEDIUM
+        assert detector._determine_severity(
+            AnomalyType.ERROR_RATE_SPIKE, 0.10, 0.05
+        ) == Severity.HIGH
+        assert detector._determine_severity(
+            AnomalyType.ERROR_RATE_SPIKE, 0.20, 0.05
+        ) == Severity.CRITICAL
+        assert detector._determine_severity(
+            AnomalyType.LATENCY_SPIKE, 1500, 1000
+        ) == Severity.LOW
+        assert detector._determine_severity(
+            AnomalyType.LATENCY_SPIKE, 3000, 1000
+        ) == Severity.HIGH
+
+        # Resource usage is binned on the absolute percentage
+        assert detector._determine_severity(
+            AnomalyType.CPU_OVERLOAD, 85, 80
+        ) == Severity.MEDIUM
+        assert detector._determine_severity(
+            AnomalyType.MEMORY_OVERLOAD, 90, 85
+        ) == Severity.HIGH
+        assert detector._determine_severity(
+            AnomalyType.CPU_OVERLOAD, 97, 80
+        ) == Severity.CRITICAL
+
+        assert detector._determine_severity(
+            AnomalyType.POD_CRASH_LOOP, 5, 3
+        ) == Severity.MEDIUM
+
 
 class TestMetricsCollector:
     """Tests for the MetricsCollector class."""
@@ -209,6 +276,27 @@ class TestMetricsCollector:
             
             assert result is False
 
+    def test_filter_query_injects_label_matchers(self):
+        """Test that service filters are pushed into the PromQL selectors."""
+        from src.core.metrics_collector import _filter_query
+
+        query = _filter_query(
+            'sum(rate(http_requests_total{status=~"5.."}[5m])) by (service, namespace)'
+            ' / sum(container_memory_usage_bytes) by (pod, namespace)',
+            "payment-service",
+            "production"
+        )
+
+        assert (
+            'http_requests_total{status=~"5..", '
+            'service=~".*payment\\\\-service.*", namespace="production"}'
+        ) in query
+        assert (
+            'container_memory_usage_bytes{'
+            'pod=~".*payment\\\\-service.*", namespace="production"}'
+        ) in query
+        assert "by (service, namespace)" in query
+
 
 class TestAlerter:
     """Tests for the Alerter class."""
@@ -240,6 +328,336 @@ class TestAlerter:
             
             assert result is True
 
+    @pytest.mark.asyncio
+    async def test_batcher_coalesces_events(self, alerter):
+        """Test that queued events go out in one batch POST on flush."""
+        from src.core.anomaly_detector import AnomalyType, Severity
+        from src.core._standalone import AnomalyEvent
+
+        events = [
+            AnomalyEvent(
+                event_id=f"evt-{i}",
+                timestamp=datetime.utcnow(),
+                source_service="monitoring",
+                anomaly_type=AnomalyType.ERROR_RATE_SPIKE,
+                severity=Severity.HIGH,
+                target_service=f"svc-{i}",
+                target_namespace="default",
+                metric_name="error_rate",
+                current_value=0.2,
+                threshold_value=0.05,
+            )
+            for i in range(3)
+        ]
+
+        with patch.object(alerter, '_get_client') as mock_get_client:
+            mock_client = AsyncMock()
+            mock_response = MagicMock()
+            mock_response.status_code = 202
+            mock_client.post.return_value = mock_response
+            mock_get_client.return_value = mock_client
+
+            alerter.start_batching()
+            result = await alerter.send_anomaly_events(events[:2])
+            await alerter.send_anomaly_events(events[2:])
+            assert result["queued"] == 2
+            await alerter.stop_batching()
+
+            mock_client.post.assert_called_once()
+            url = mock_client.post.call_args.args[0]
+            body = orjson.loads(mock_client.post.call_args.kwargs["content"])
+            assert url.endswith("/api/v1/events/anomaly/batch")
+            assert [e["event_id"] for e in body["events"]] == ["evt-0", "evt-1", "evt-2"]
+
+    @pytest.mark.asyncio
+    async def test_dead_batcher_falls_back_to_direct_send(self, alerter):
+        """Test that events are sent directly once the batcher task has died."""
+        import asyncio
+        from src.core.anomaly_detector import AnomalyType, Severity
+        from src.core._standalone import AnomalyEvent
+
+        event = AnomalyEvent(
+            event_id="evt-0",
+            timestamp=datetime.utcnow(),
+            source_service="monitoring",
+            anomaly_type=AnomalyType.ERROR_RATE_SPIKE,
+            severity=Severity.HIGH,
+            target_service="svc-0",
+            target_namespace="default",
+            metric_name="error_rate",
+            current_value=0.2,
+            threshold_value=0.05,
+        )
+
+        with patch.object(alerter, '_get_client') as mock_get_client:
+            mock_client = AsyncMock()
+            mock_response = MagicMock()
+            mock_response.status_code = 202
+            mock_client.post.return_value = mock_response
+            mock_get_client.return_value = mock_client
+
+            alerter.start_batching()
+            alerter._batcher_task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await alerter._batcher_task
+
+            result = await alerter.send_anomaly_events([event])
+
+            assert result == {"sent": 1, "failed": 0, "queued": 0}
+            mock_client.post.assert_called_once()
+            assert alerter._batcher_task is None
+
+    @pytest.mark.asyncio
+    async def test_batch_retries_then_falls_back_to_single_events(self, alerter):
+        """Test that a batch the server keeps failing is sent per event."""
+        from src.core.anomaly_detector import AnomalyType, Severity
+        from src.core._standalone import AnomalyEvent
+
+        events = [
+            AnomalyEvent(
+                event_id=f"evt-{i}",
+                timestamp=datetime.utcnow(),
+                source_service="monitoring",
+                anomaly_type=AnomalyType.ERROR_RATE_SPIKE,
+                severity=Severity.HIGH,
+                target_service=f"svc-{i}",
+                target_namespace="default",
+                metric_name="error_rate",
+                current_value=0.2,
+                threshold_value=0.05,
+            )
+            for i in range(2)
+        ]
+        alerter.retry_delay = 0
+
+        def reply(url, **kwargs):
+            response = MagicMock()
+            response.status_code = 503 if url.endswith("/batch") else 202
+            return response
+
+        with patch.object(alerter, '_get_client') as mock_get_client:
+            mock_client = AsyncMock()
+            mock_client.post.side_effect = reply
+            mock_get_client.return_value = mock_client
+
+            result = await alerter.send_anomaly_events(events)
+
+            urls = [call.args[0] for call in mock_client.post.call_args_list]
+            assert result == {"sent": 2, "failed": 0, "queued": 0}
+            assert sum(url.endswith("/batch") for url in urls) == alerter.max_retries + 1
+            assert sum(url.endswith("/anomaly") for url in urls) == 2
+
+    @pytest.mark.asyncio
+    async def test_rejected_batch_is_not_retried(self, alerter):
+        """Test that a 4xx batch reply skips straight to per-event sends."""
+        from src.core.anomaly_detector import AnomalyType, Severity
+        from src.core._standalone import AnomalyEvent
+
+        event = AnomalyEvent(
+            event_id="evt-0",
+            timestamp=datetime.utcnow(),
+            source_service="monitoring",
+            anomaly_type=AnomalyType.ERROR_RATE_SPIKE,
+            severity=Severity.HIGH,
+            target_service="svc-0",
+            target_namespace="default",
+            metric_name="error_rate",
+            current_value=0.2,
+            threshold_value=0.05,
+        )
+
+        def reply(url, **kwargs):
+            response = MagicMock()
+            response.status_code = 404 if url.endswith("/batch") else 202
+            return response
+
+        with patch.object(alerter, '_get_client') as mock_get_client:
+            mock_client = AsyncMock()
+            mock_client.post.side_effect = reply
+            mock_get_client.return_value = mock_client
+
+            result = await alerter.send_anomaly_events([event])
+
+            urls = [call.args[0] for call in mock_client.post.call_args_list]
+            assert result == {"sent": 1, "failed": 0, "queued": 0}
+            assert urls == [
+                "http://incident-manager:8002/api/v1/events/anomaly/batch",
+                "http://incident-manager:8002/api/v1/events/anomaly",
+            ]
+
+
+class TestMetricPolling:
+    """Tests for the metric polling schedule and cycle."""
+    
+    @pytest.fixture
+    def mock_settings(self):
+        """Create mock settings for testing."""
+        settings = MagicMock()
+        settings.anomaly_threshold_error_rate = 0.05
+        settings.anomaly_threshold_latency_p99_ms = 1000
+        settings.anomaly_threshold_latency_p95_ms = 500
+        settings.anomaly_threshold_cpu_percent = 80
+        settings.anomaly_threshold_memory_percent = 85
+        settings.alert_cooldown_seconds = 300
+        return settings
+    
+    def test_grid_point_is_on_scrape_boundary(self):
+        """Test that the first slot lands scrape_offset after a wall-clock boundary."""
+        from src.main import _scrape_grid_point
+
+        # Monotonic clock 1000s behind the wall clock
+        assert _scrape_grid_point(205.0, 1205.0, 15, 1.0) == 201.0
+        assert _scrape_grid_point(201.0, 1201.0, 15, 1.0) == 201.0
+        assert _scrape_grid_point(200.5, 1200.5, 15, 1.0) == 186.0
+
+        # Only the wall-clock phase matters, not the monotonic origin
+        assert _scrape_grid_point(5.0, 1205.0, 15, 1.0) == 1.0
+
+    def test_schedule_settings_must_be_positive(self):
+        """Test that a zero scrape interval or offset is rejected at startup."""
+        from pydantic import ValidationError
+        from src.config import Settings
+
+        for field in (
+            "prometheus_scrape_interval",
+            "prometheus_scrape_offset_seconds",
+            "polling_interval_seconds",
+        ):
+            with pytest.raises(ValidationError):
+                Settings(**{field: 0})
+
+    def test_next_poll_steps_whole_scrape_intervals(self):
+        """Test that the interval is rounded up to whole scrape intervals."""
+        from src.main import _next_poll_time
+
+        assert _next_poll_time(100.0, 101.0, 15, 15) == 115.0
+        assert _next_poll_time(100.0, 101.0, 20, 15) == 130.0
+        assert _next_poll_time(100.0, 101.0, 5, 15) == 115.0
+
+    def test_early_wake_does_not_poll_twice(self):
+        """Test that a timer firing before its slot still advances a full step."""
+        from src.main import _next_poll_time
+
+        # Woken 10ms before the slot at 115 and finished polling by then
+        assert _next_poll_time(115.0, 114.99, 15, 15) == 130.0
+
+    def test_overrun_skips_to_next_slot(self):
+        """Test that a cycle overrunning its slot waits for the following one."""
+        from src.main import _next_poll_time
+
+        assert _next_poll_time(100.0, 117.0, 15, 15) == 130.0
+        assert _next_poll_time(100.0, 145.0, 15, 15) == 145.0
+
+    @pytest.mark.asyncio
+    async def test_unchanged_metrics_still_run_detection(self, mock_settings):
+        """Test that a steady violation re-alerts once its cooldown expires."""
+        from src.main import _poll_once
+        from src.core.anomaly_detector import AnomalyDetector
+
+        clock = [1000.0]
+        detector = AnomalyDetector(mock_settings)
+        metrics = [
+            ServiceMetrics(
+                service_name="payment-service",
+                namespace="production",
+                metrics=[
+                    MetricValue(metric_type=MetricType.ERROR_RATE, value=0.5, labels={})
+                ]
+            )
+        ]
+        collector = MagicMock()
+        collector.collect_all_metrics = AsyncMock(return_value=metrics)
+        alerter = MagicMock()
+        alerter.send_anomaly_events = AsyncMock()
+
+        with patch("src.core.anomaly_detector.time.monotonic", lambda: clock[0]):
+            fingerprint = await _poll_once(collector, detector, alerter, None)
+            assert alerter.send_anomaly_events.await_count == 1
+
+            # Same samples inside the cooldown: detection runs, nothing is sent
+            clock[0] += 60
+            assert await _poll_once(collector, detector, alerter, fingerprint) == fingerprint
+            assert alerter.send_anomaly_events.await_count == 1
+
+            # Same samples after the cooldown: the anomaly is alerted again
+            clock[0] += 300
+            await _poll_once(collector, detector, alerter, fingerprint)
+            assert alerter.send_anomaly_events.await_count == 2
+
+
+class TestHealthEndpoint:
+    """Tests for the /health fast path."""
+    
+    @pytest.fixture
+    def client(self):
+        """TestClient for the app, without running the lifespan."""
+        from fastapi.testclient import TestClient
+        from src.main import app
+        return TestClient(app)
+    
+    def test_probe_gets_health_body(self, client):
+        """Test that a plain GET is answered with the service status."""
+        from src.main import settings
+
+        response = client.get("/health")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {
+            "status": "healthy",
+            "service": settings.service_name,
+            "version": settings.service_version,
+        }
+        assert "X-Correlation-ID" not in response.headers
+
+    def test_head_is_answered(self, client):
+        """Test that HEAD probes take the fast path too."""
+        assert client.head("/health").status_code == 200
+
+    def test_other_methods_are_not_answered(self, client):
+        """Test that POST does not get a health body."""
+        assert client.post("/health").status_code == 405
+
+    def test_cross_origin_requests_get_cors_headers(self, client):
+        """Test that browser requests go through the CORS middleware."""
+        response = client.get("/health", headers={"Origin": "http://dashboard"})
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "http://dashboard"
+
+        preflight = client.options(
+            "/health",
+            headers={
+                "Origin": "http://dashboard",
+                "Access-Control-Request-Method": "GET",
+            }
+        )
+        assert preflight.status_code == 200
+        assert "access-control-allow-methods" in preflight.headers
+
+    def test_health_hidden_from_schema(self, client):
+        """Test that /health is not part of the documented API."""
+        assert "/health" not in client.get("/openapi.json").json()["paths"]
+
+
+class TestMetricsEndpoint:
+    """Tests for the Prometheus scrape endpoint."""
+    
+    def test_metrics_served_in_one_uncompressed_body(self):
+        """Test the exposition format, length and encoding of a scrape."""
+        from fastapi.testclient import TestClient
+        from prometheus_client import CONTENT_TYPE_LATEST
+        from src.main import app
+
+        response = TestClient(app).get(
+            "/metrics", headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == CONTENT_TYPE_LATEST
+        assert int(response.headers["content-length"]) == len(response.content)
+        assert "content-encoding" not in response.headers
+        assert b"autoheal_monitoring_polls_total" in response.content
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
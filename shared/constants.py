@@ -110,3 +110,19 @@ SERVICE_PORTS = {
     ServiceName.K8S_EXECUTOR: 8004,
     ServiceName.AUDIT_SERVICE: 8005,
 }
+
+
+def port_for(service: ServiceName | str) -> int:
+    """
+    Look up the default port for a service.
+    
+    Args:
+        service: ServiceName member or its string value (e.g. "monitoring")
+        
+    Returns:
+        Default port of the service
+        
+    Raises:
+        ValueError: If service is not a known service name
+    """
+    return SERVICE_PORTS[ServiceName(service)]
@@ -8,7 +8,7 @@ These schemas define the contract for inter-service communication.
 
 from datetime import datetime
 from typing import Optional, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
 from shared.constants import Severity, AnomalyType, LogErrorType, IncidentStatus
@@ -34,10 +34,15 @@ class BaseEvent(BaseModel):
         description="Name of the service that generated this event"
     )
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    # Datetimes serialize to ISO 8601 natively in pydantic-core; a Python
+    # json_encoders hook would add a call per timestamp per dump.
+    model_config = ConfigDict(
+        # Events are immutable once built; derive changed copies with
+        # model_copy(update={...}). Unknown fields are rejected so producer
+        # typos fail loudly instead of being silently dropped.
+        frozen=True,
+        extra="forbid",
+    )
 
 
 class AnomalyEvent(BaseEvent):
@@ -0,0 +1,44 @@
+"""
+AutoHeal AI - Constants Tests
+==============================
+
+Unit tests for shared constants and lookups.
+"""
+
+import pytest
+
+import sys
+import os
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from shared.constants import SERVICE_PORTS, ServiceName, port_for
+
+
+class TestPortFor:
+    """Tests for the service port lookup."""
+
+    def test_lookup_by_member(self):
+        """Test lookup with a ServiceName member."""
+        assert port_for(ServiceName.MONITORING) == 8000
+        assert port_for(ServiceName.AUDIT_SERVICE) == 8005
+
+    def test_lookup_by_string(self):
+        """Test lookup with the service's string value."""
+        assert port_for("incident-manager") == 8002
+        assert port_for("log-intelligence") == port_for(ServiceName.LOG_INTELLIGENCE)
+
+    def test_every_service_has_a_port(self):
+        """Test that every service name resolves to a port."""
+        for service in ServiceName:
+            assert port_for(service) == SERVICE_PORTS[service]
+
+    def test_unknown_service_raises(self):
+        """Test that an unknown service name raises ValueError."""
+        with pytest.raises(ValueError):
+            port_for("billing")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
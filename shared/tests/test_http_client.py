@@ -0,0 +1,140 @@
+"""
+AutoHeal AI - HTTP Client Tests
+================================
+
+Unit tests for the shared inter-service HTTP client.
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+import sys
+import os
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from shared.utils.http_client import _CLIENTS, ServiceClient, close_all_clients
+from shared.utils.logging import correlation_id_var
+
+
+class TestServiceClientRequest:
+    """Tests for ServiceClient request dispatch."""
+
+    @pytest.fixture
+    def requests(self):
+        """Requests seen by the mock upstream."""
+        return []
+
+    @pytest.fixture
+    def mock_client(self, requests):
+        """AsyncClient backed by a transport that records requests."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"ok": True})
+
+        return httpx.AsyncClient(
+            base_url="http://incident-manager:8002",
+            transport=httpx.MockTransport(handler)
+        )
+
+    @pytest.mark.asyncio
+    async def test_verbs_dispatch_through_request(self, mock_client, requests):
+        """Test method, path, query and body for each verb."""
+        client = ServiceClient("http://incident-manager:8002")
+
+        with patch.object(
+            ServiceClient, '_get_client', AsyncMock(return_value=mock_client)
+        ):
+            await client.get("/api/v1/incidents", params={"page": 2})
+            await client.post("/api/v1/events/anomaly", data={"event_id": "e1"})
+            await client.put("/api/v1/incidents/1", data={"status": "resolved"})
+            await client.delete("/api/v1/incidents/1")
+
+        assert [(r.method, r.url.path) for r in requests] == [
+            ("GET", "/api/v1/incidents"),
+            ("POST", "/api/v1/events/anomaly"),
+            ("PUT", "/api/v1/incidents/1"),
+            ("DELETE", "/api/v1/incidents/1"),
+        ]
+        assert requests[0].url.params["page"] == "2"
+        assert json.loads(requests[1].content) == {"event_id": "e1"}
+        assert json.loads(requests[2].content) == {"status": "resolved"}
+        assert requests[3].content == b""
+
+    @pytest.mark.asyncio
+    async def test_headers_include_correlation_id(self, mock_client, requests):
+        """Test base, extra and correlation ID headers."""
+        client = ServiceClient("http://incident-manager:8002")
+        token = correlation_id_var.set("cid-123")
+
+        try:
+            with patch.object(
+                ServiceClient, '_get_client', AsyncMock(return_value=mock_client)
+            ):
+                await client.get("/health", headers={"X-Extra": "1"})
+        finally:
+            correlation_id_var.reset(token)
+
+        headers = requests[0].headers
+        assert headers["X-Correlation-ID"] == "cid-123"
+        assert headers["X-Extra"] == "1"
+        assert headers["User-Agent"] == "AutoHeal-ServiceClient/1.0"
+
+
+class TestSharedClientCache:
+    """Tests for the per-event-loop shared client cache."""
+
+    def test_clients_shared_within_a_loop(self):
+        """Test that clients for the same upstream share one AsyncClient."""
+        async def run():
+            first = await ServiceClient("http://audit-service:8005")._get_client()
+            second = await ServiceClient("http://audit-service:8005/")._get_client()
+            other = await ServiceClient("http://policy-engine:8004")._get_client()
+            await close_all_clients()
+            return first, second, other
+
+        first, second, other = asyncio.run(run())
+
+        assert first is second
+        assert other is not first
+
+    def test_cache_rebuilt_after_close_all_clients(self):
+        """Test that a closed shared client is replaced, not reused."""
+        async def run():
+            client = ServiceClient("http://audit-service:8005")
+            before = await client._get_client()
+            await close_all_clients()
+            after = await client._get_client()
+            reopened = after.is_closed
+            await close_all_clients()
+            return before, after, reopened
+
+        before, after, reopened = asyncio.run(run())
+
+        assert before.is_closed
+        assert after is not before
+        assert not reopened
+
+    def test_cache_keyed_by_event_loop(self):
+        """Test that each event loop gets its own client and stale loops are dropped."""
+        client = ServiceClient("http://audit-service:8005")
+
+        async def run():
+            return asyncio.get_running_loop(), await client._get_client()
+
+        first_loop, first = asyncio.run(run())
+        _, second = asyncio.run(run())
+
+        assert second is not first
+        assert first_loop not in _CLIENTS
+        assert first_loop.is_closed()
+        _CLIENTS.clear()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,124 @@
+"""
+AutoHeal AI - Logging Tests
+============================
+
+Unit tests for the shared structured logging setup.
+"""
+
+import io
+import json
+import logging
+import pytest
+
+import sys
+import os
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from shared.utils.logging import (
+    correlation_id_var,
+    setup_logging,
+    _stop_listener,
+)
+
+
+class TestStructuredLogging:
+    """Tests for JSON logging through the background queue listener."""
+
+    @pytest.fixture
+    def log_lines(self, monkeypatch):
+        """Configure logging and return a function reading emitted entries."""
+        stream = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", stream)
+        setup_logging(service_name="test-svc", log_level="INFO")
+
+        def read() -> list[dict]:
+            # Stopping the listener flushes everything still queued
+            _stop_listener()
+            return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+        yield read
+
+        _stop_listener()
+        logging.getLogger().handlers.clear()
+
+    def test_json_output_through_queue(self, log_lines):
+        """Test message args, extra fields and service name."""
+        logging.getLogger("test").info("hello %s", "world", extra={"count": 3})
+
+        entries = log_lines()
+
+        assert len(entries) == 1
+        assert entries[0]["message"] == "hello world"
+        assert entries[0]["level"] == "INFO"
+        assert entries[0]["service"] == "test-svc"
+        assert entries[0]["count"] == 3
+
+    def test_exception_is_structured(self, log_lines):
+        """Test that tracebacks land in the exception field, not the message."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("test").exception("failed")
+
+        entries = log_lines()
+
+        assert entries[0]["message"] == "failed"
+        assert "ValueError: boom" in entries[0]["exception"]
+
+    def test_correlation_id_captured_in_caller_context(self, log_lines):
+        """Test that the caller's correlation ID survives the thread hop."""
+        token = correlation_id_var.set("cid-456")
+        try:
+            logging.getLogger("test").warning("with id")
+        finally:
+            correlation_id_var.reset(token)
+        logging.getLogger("test").warning("without id")
+
+        entries = log_lines()
+
+        assert entries[0]["correlation_id"] == "cid-456"
+        assert "correlation_id" not in entries[1]
+
+
+class TestBinaryLogging:
+    """Tests for MessagePack log output."""
+
+    class _Stdout:
+        """Stand-in for sys.stdout recording each binary write separately."""
+
+        def __init__(self):
+            self.writes: list[bytes] = []
+            self.buffer = self
+
+        def write(self, data: bytes) -> None:
+            self.writes.append(data)
+
+        def flush(self) -> None:
+            pass
+
+    def test_binary_output_is_msgpack(self, monkeypatch):
+        """Test that each record is written as one MessagePack map."""
+        msgspec = pytest.importorskip("msgspec")
+        stdout = self._Stdout()
+        monkeypatch.setattr(sys, "stdout", stdout)
+
+        try:
+            setup_logging(service_name="test-svc", binary_output=True)
+            logging.getLogger("test").info("first")
+            logging.getLogger("test").error("second", extra={"count": 2})
+            _stop_listener()
+        finally:
+            logging.getLogger().handlers.clear()
+
+        entries = [msgspec.msgpack.decode(data) for data in stdout.writes]
+
+        assert [e["message"] for e in entries] == ["first", "second"]
+        assert entries[1]["level"] == "ERROR"
+        assert entries[1]["service"] == "test-svc"
+        assert entries[1]["count"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,143 @@
+"""
+AutoHeal AI - Retry Utilities Tests
+====================================
+
+Unit tests for retry backoff and the circuit breaker.
+"""
+
+import pytest
+
+import sys
+import os
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from shared.utils.retry import CircuitBreaker, RetryConfig, calculate_delay
+
+
+class TestCalculateDelay:
+    """Tests for backoff delay calculation and jitter."""
+
+    def test_no_jitter_is_exact(self):
+        """Test that "none" returns the capped exponential delay."""
+        assert calculate_delay(0, 1.0, 30.0, 2.0, "none") == 1.0
+        assert calculate_delay(3, 1.0, 30.0, 2.0, "none") == 8.0
+        assert calculate_delay(10, 1.0, 30.0, 2.0, "none") == 30.0
+
+    def test_full_jitter_bounds(self):
+        """Test that "full" jitter stays within [0, backoff]."""
+        for _ in range(200):
+            delay = calculate_delay(2, 1.0, 30.0, 2.0, "full")
+            assert 0.0 <= delay <= 4.0
+
+    def test_equal_jitter_bounds(self):
+        """Test that "equal" jitter stays within half the ratio of the backoff."""
+        for _ in range(200):
+            delay = calculate_delay(2, 1.0, 30.0, 2.0, "equal", 0.5)
+            assert 3.0 <= delay <= 5.0
+
+        # Never above max_delay, even when the spread would push it over
+        for _ in range(200):
+            delay = calculate_delay(10, 1.0, 30.0, 2.0, "equal", 1.0)
+            assert 15.0 <= delay <= 30.0
+
+    def test_unknown_jitter_raises(self):
+        """Test that an unknown jitter mode is rejected."""
+        with pytest.raises(ValueError):
+            calculate_delay(0, 1.0, 30.0, 2.0, "bogus")
+
+    def test_defaults_match(self):
+        """Test that RetryConfig and calculate_delay default to equal jitter."""
+        config = RetryConfig()
+        assert config.jitter == "equal"
+        assert config.jitter_ratio == 0.5
+
+        for _ in range(200):
+            delay = calculate_delay(2, 1.0, 30.0, 2.0)
+            assert 3.0 <= delay <= 5.0
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker state transitions."""
+
+    def test_opens_after_failure_threshold(self):
+        """Test CLOSED -> OPEN once the failure threshold is reached."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.can_execute()
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.can_execute()
+
+    def test_success_resets_failure_count(self):
+        """Test that a success while CLOSED clears earlier failures."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_success_closes(self):
+        """Test OPEN -> HALF_OPEN -> CLOSED when the probe succeeds."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        assert breaker.can_execute()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.can_execute()
+
+    def test_half_open_failure_reopens(self):
+        """Test OPEN -> HALF_OPEN -> OPEN when the probe fails."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+
+        assert breaker.can_execute()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_half_open_max_calls_limits_probes(self):
+        """Test that only half_open_max_calls probes get through."""
+        breaker = CircuitBreaker(
+            failure_threshold=1,
+            reset_timeout=0,
+            half_open_max_calls=2
+        )
+        breaker.record_failure()
+
+        assert breaker.can_execute()
+        assert breaker.can_execute()
+        assert not breaker.can_execute()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    def test_stays_open_before_reset_timeout(self):
+        """Test that the circuit stays OPEN until the timeout passes."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+
+        assert not breaker.can_execute()
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_reset_closes_circuit(self):
+        """Test manual reset back to CLOSED."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+
+        breaker.reset()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.can_execute()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -6,13 +6,19 @@ Common utility functions for logging, HTTP clients, and retry logic.
 """
 
 from shared.utils.logging import get_logger, setup_logging
-from shared.utils.http_client import ServiceClient
+from shared.utils.http_client import (
+    ServiceClient,
+    close_all_clients,
+    health_check_many,
+)
 from shared.utils.retry import with_retry, RetryConfig
 
 __all__ = [
     "get_logger",
     "setup_logging", 
     "ServiceClient",
+    "close_all_clients",
+    "health_check_many",
     "with_retry",
     "RetryConfig",
 ]
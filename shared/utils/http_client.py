@@ -12,23 +12,65 @@ Usage:
     response = await client.post("/api/v1/incidents", data=incident_data)
 """
 
+import asyncio
+import logging
+import weakref
 import httpx
 from typing import Any, Optional
 from dataclasses import dataclass
 from contextlib import asynccontextmanager
 
-from shared.utils.logging import get_logger, get_correlation_id
+from shared.utils.logging import get_logger, correlation_id_var
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); without it clients
+# fall back to HTTP/1.1 keep-alive
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 logger = get_logger(__name__)
 
+# Bound once so the per-request header build skips the attribute lookup
+_cid_get = correlation_id_var.get
+
+# Clients shared by every ServiceClient with the same base URL and connection
+# settings, so calls to an upstream reuse (and, over HTTP/2, multiplex)
+# pooled connections instead of each instance opening its own. Kept per event
+# loop, since pooled connections are bound to the loop that opened them.
+_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _loop_clients(loop: asyncio.AbstractEventLoop) -> dict[tuple, httpx.AsyncClient]:
+    """Get the shared-client cache for an event loop."""
+    clients = _CLIENTS.get(loop)
+    if clients is None:
+        # Open connections reference their loop, so entries for loops that
+        # were closed without close_all_clients() are dropped here
+        for stale in [other for other in _CLIENTS.keys() if other.is_closed()]:
+            del _CLIENTS[stale]
+        clients = _CLIENTS[loop] = {}
+    return clients
 
-@dataclass
+
+@dataclass(slots=True)
 class ServiceClientConfig:
     """Configuration for the HTTP service client."""
     timeout_seconds: float = 30.0
     max_retries: int = 3
     retry_delay_seconds: float = 1.0
     retry_backoff_multiplier: float = 2.0
+    # Connection pool for the upstream. Over HTTP/2, httpcore multiplexes up
+    # to min(100, the server's advertised limit) streams per connection and
+    # queues the rest on it; set http2=False for high-fanout callers that
+    # would rather spread requests over several HTTP/1.1 connections.
+    http2: bool = True
+    max_connections_per_host: int = 256
+    max_keepalive_connections: int = 64
+    keepalive_expiry_seconds: float = 90.0
 
 
 class ServiceClient:
@@ -37,7 +79,8 @@ class ServiceClient:
     
     Features:
     - Automatic correlation ID propagation
-    - Connection pooling
+    - Connection pooling shared process-wide per upstream (HTTP/2 if h2
+      is installed)
     - Configurable timeouts
     - Async context manager support
     
@@ -48,6 +91,8 @@ class ServiceClient:
                 print("Audit logged successfully")
     """
     
+    __slots__ = ("_base_headers", "_client", "_loop", "base_url", "config")
+    
     def __init__(
         self,
         base_url: str,
@@ -63,27 +108,58 @@ class ServiceClient:
         self.base_url = base_url.rstrip("/")
         self.config = config or ServiceClientConfig()
         self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Copied per request instead of rebuilding the literal each time
+        self._base_headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "User-Agent": "AutoHeal-ServiceClient/1.0",
+        }
     
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create the async HTTP client."""
-        if self._client is None:
-            self._client = httpx.AsyncClient(
-                base_url=self.base_url,
-                timeout=httpx.Timeout(self.config.timeout_seconds),
-                follow_redirects=True
+        """
+        Get the shared async HTTP client for this upstream.
+        
+        No await happens between the lookup and the insert, so concurrent
+        coroutines cannot create duplicate clients and no lock is needed.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop or self._client.is_closed:
+            config = self.config
+            http2 = config.http2 and HTTP2_AVAILABLE
+            key = (
+                self.base_url,
+                config.timeout_seconds,
+                http2,
+                config.max_connections_per_host,
+                config.max_keepalive_connections,
+                config.keepalive_expiry_seconds,
             )
+            clients = _loop_clients(loop)
+            client = clients.get(key)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    base_url=self.base_url,
+                    http2=http2,
+                    timeout=httpx.Timeout(config.timeout_seconds),
+                    limits=httpx.Limits(
+                        max_connections=config.max_connections_per_host,
+                        max_keepalive_connections=config.max_keepalive_connections,
+                        keepalive_expiry=config.keepalive_expiry_seconds
+                    ),
+                    follow_redirects=True
+                )
+                clients[key] = client
+            self._client = client
+            self._loop = loop
         return self._client
     
     def _build_headers(self, extra_headers: Optional[dict] = None) -> dict:
         """Build request headers with correlation ID."""
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "User-Agent": "AutoHeal-ServiceClient/1.0",
-        }
+        headers = self._base_headers.copy()
         
         # Propagate correlation ID for distributed tracing
-        correlation_id = get_correlation_id()
+        correlation_id = _cid_get()
         if correlation_id:
             headers["X-Correlation-ID"] = correlation_id
         
@@ -92,43 +168,75 @@ class ServiceClient:
         
         return headers
     
-    async def get(
+    async def _request(
         self,
+        method: str,
         path: str,
+        *,
         params: Optional[dict] = None,
+        data: Optional[dict[str, Any]] = None,
         headers: Optional[dict] = None
     ) -> httpx.Response:
         """
-        Make a GET request to the service.
+        Make a request to the service.
         
         Args:
+            method: HTTP method, uppercase (e.g., "GET")
             path: API path (e.g., "/api/v1/health")
             params: Optional query parameters
+            data: Optional JSON payload
             headers: Optional additional headers
             
         Returns:
             httpx.Response object
         """
         client = await self._get_client()
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         
-        logger.debug(
-            f"GET {self.base_url}{path}",
-            extra={"params": params}
-        )
+        if debug_enabled:
+            logger.debug(
+                f"{method} {self.base_url}{path}",
+                extra={
+                    "params": params,
+                    "payload_keys": list(data.keys()) if data else []
+                }
+            )
         
-        response = await client.get(
+        response = await client.request(
+            method,
             path,
             params=params,
+            json=data,
             headers=self._build_headers(headers)
         )
         
-        logger.debug(
-            f"Response: {response.status_code}",
-            extra={"path": path, "status": response.status_code}
-        )
+        if debug_enabled:
+            logger.debug(
+                f"Response: {response.status_code}",
+                extra={"path": path, "status": response.status_code}
+            )
         
         return response
     
+    async def get(
+        self,
+        path: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None
+    ) -> httpx.Response:
+        """
+        Make a GET request to the service.
+        
+        Args:
+            path: API path (e.g., "/api/v1/health")
+            params: Optional query parameters
+            headers: Optional additional headers
+            
+        Returns:
+            httpx.Response object
+        """
+        return await self._request("GET", path, params=params, headers=headers)
+    
     async def post(
         self,
         path: str,
@@ -146,25 +254,7 @@ class ServiceClient:
         Returns:
             httpx.Response object
         """
-        client = await self._get_client()
-        
-        logger.debug(
-            f"POST {self.base_url}{path}",
-            extra={"payload_keys": list(data.keys()) if data else []}
-        )
-        
-        response = await client.post(
-            path,
-            json=data,
-            headers=self._build_headers(headers)
-        )
-        
-        logger.debug(
-            f"Response: {response.status_code}",
-            extra={"path": path, "status": response.status_code}
-        )
-        
-        return response
+        return await self._request("POST", path, data=data, headers=headers)
     
     async def put(
         self,
@@ -183,15 +273,7 @@ class ServiceClient:
         Returns:
             httpx.Response object
         """
-        client = await self._get_client()
-        
-        response = await client.put(
-            path,
-            json=data,
-            headers=self._build_headers(headers)
-        )
-        
-        return response
+        return await self._request("PUT", path, data=data, headers=headers)
     
     async def delete(
         self,
@@ -208,14 +290,43 @@ class ServiceClient:
         Returns:
             httpx.Response object
         """
-        client = await self._get_client()
+        return await self._request("DELETE", path, headers=headers)
+    
+    async def gather_get(
+        self,
+        items: list[tuple[str, Optional[dict]]]
+    ) -> list[httpx.Response]:
+        """
+        Make several GET requests to the service concurrently.
         
-        response = await client.delete(
-            path,
-            headers=self._build_headers(headers)
-        )
+        Over HTTP/2 the requests are multiplexed on the shared connection,
+        so fan-out costs roughly one round trip instead of one per path;
+        over HTTP/1.1 they are spread across pooled connections.
         
-        return response
+        Args:
+            items: (path, params) pairs
+            
+        Returns:
+            Responses in the same order as items
+        """
+        return await asyncio.gather(*(self.get(p, params) for p, params in items))
+    
+    async def gather_post(
+        self,
+        items: list[tuple[str, Optional[dict[str, Any]]]]
+    ) -> list[httpx.Response]:
+        """
+        Make several POST requests to the service concurrently.
+        
+        See gather_get; the win depends on http2 being enabled.
+        
+        Args:
+            items: (path, JSON payload) pairs
+            
+        Returns:
+            Responses in the same order as items
+        """
+        return await asyncio.gather(*(self.post(p, data) for p, data in items))
     
     async def health_check(self) -> bool:
         """
@@ -235,10 +346,14 @@ class ServiceClient:
             return False
     
     async def close(self) -> None:
-        """Close the HTTP client and release resources."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        """
+        Release this instance's client.
+        
+        The underlying connection pool is shared with other instances and
+        stays open; close_all_clients() in the service lifespan closes it.
+        """
+        self._client = None
+        self._loop = None
     
     async def __aenter__(self) -> "ServiceClient":
         """Async context manager entry."""
@@ -249,6 +364,41 @@ class ServiceClient:
         await self.close()
 
 
+async def close_all_clients() -> None:
+    """
+    Close every shared HTTP client opened on the running event loop.
+    
+    Call once from the service's lifespan shutdown.
+    """
+    clients = _CLIENTS.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
+
+
+async def health_check_many(
+    clients: list[ServiceClient],
+    concurrency: int = 32
+) -> dict[str, bool]:
+    """
+    Probe several services' health endpoints concurrently.
+    
+    Args:
+        clients: Clients for the services to probe
+        concurrency: Maximum number of probes in flight at once
+        
+    Returns:
+        Mapping of base URL to whether the service is healthy
+    """
+    sem = asyncio.Semaphore(concurrency)
+    
+    async def probe(client: ServiceClient) -> bool:
+        async with sem:
+            return await client.health_check()
+    
+    results = await asyncio.gather(*(probe(c) for c in clients))
+    return {c.base_url: healthy for c, healthy in zip(clients, results)}
+
+
 @asynccontextmanager
 async def create_service_client(
     base_url: str,
@@ -257,8 +407,8 @@ async def create_service_client(
     """
     Create a service client as an async context manager.
     
-    This is the recommended way to use the ServiceClient for
-    one-off requests to ensure proper cleanup.
+    Convenience wrapper for one-off requests. The connection pool is
+    shared and outlives the block; it is closed by close_all_clients().
     
     Example:
         async with create_service_client("http://audit:8005") as client:
@@ -14,15 +14,54 @@ Usage:
     logger.info("Processing request", extra={"correlation_id": "abc123"})
 """
 
+import atexit
+import copy
 import logging
 import json
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime, timezone
 from typing import Any, Optional
 from contextvars import ContextVar
 
-# Context variable for correlation ID propagation
-correlation_id_var: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+# orjson encodes log entries in C; fall back to the stdlib encoder when a
+# service does not ship it
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+# msgspec is only needed for the opt-in MessagePack output
+try:
+    import msgspec
+    _MSGPACK_ENCODER: Optional[msgspec.msgpack.Encoder] = msgspec.msgpack.Encoder(
+        enc_hook=str
+    )
+except ImportError:
+    _MSGPACK_ENCODER = None
+
+# Context variable for correlation ID propagation. Unset reads as "" so hot
+# paths can branch on plain truthiness of a str.
+correlation_id_var: ContextVar[str] = ContextVar("correlation_id", default="")
+
+
+# LogRecord attributes that are not user-supplied extra fields
+_STANDARD_ATTRS: frozenset[str] = frozenset({
+    "name", "msg", "args", "created", "filename", "funcName",
+    "levelname", "levelno", "lineno", "module", "msecs",
+    "pathname", "process", "processName", "relativeCreated",
+    "stack_info", "exc_info", "exc_text", "thread", "threadName",
+    "taskName", "message"
+})
+
+
+def _json_default(value: Any) -> str:
+    """Stdlib json fallback: ISO 8601 for datetimes, str() for the rest."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
 
 
 class StructuredFormatter(logging.Formatter):
@@ -38,46 +77,91 @@ class StructuredFormatter(logging.Formatter):
     - message (the log message)
     - correlation_id (for distributed tracing, if available)
     - Additional fields from the extra dict
+    
+    With format_binary=True, format_bytes() emits the same entry as
+    MessagePack for collectors that accept it (Vector, Fluent Bit).
     """
     
-    def __init__(self, service_name: str):
+    def __init__(self, service_name: str, format_binary: bool = False):
         super().__init__()
+        if format_binary and _MSGPACK_ENCODER is None:
+            raise ImportError("format_binary requires the msgspec package")
         self.service_name = service_name
+        self.format_binary = format_binary
     
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON string."""
+        log_entry = self._build_entry(record)
+        
+        if _HAS_ORJSON:
+            try:
+                return orjson.dumps(log_entry, default=str).decode()
+            except TypeError:
+                # e.g. non-str dict keys or >64-bit ints in extra fields
+                pass
+        return json.dumps(log_entry, default=_json_default)
+    
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """Format log record as MessagePack, or a JSON line if not binary."""
+        encoder = _MSGPACK_ENCODER
+        if self.format_binary and encoder is not None:
+            return encoder.encode(self._build_entry(record))
+        return (self.format(record) + "\n").encode()
+    
+    def _build_entry(self, record: logging.LogRecord) -> dict[str, Any]:
+        """Build the structured log entry for a record."""
         # Base log structure
         log_entry: dict[str, Any] = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            # Encoded to ISO 8601 by the serializer (natively in orjson).
+            # Taken from the record, since formatting may happen later on
+            # the queue listener thread.
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc),
             "level": record.levelname,
             "service": self.service_name,
             "logger": record.name,
             "message": record.getMessage(),
         }
         
-        # Add correlation ID if present
-        correlation_id = correlation_id_var.get()
+        # Add correlation ID if present. ContextualLogger captures it on the
+        # record when the call is made, which stays correct even if the
+        # record is formatted outside the request's context; records from
+        # plain loggers fall back to the current context.
+        correlation_id = record.__dict__.get("correlation_id") or correlation_id_var.get()
         if correlation_id:
             log_entry["correlation_id"] = correlation_id
         
-        # Add exception info if present
+        # Add exception info if present (pre-rendered to exc_text when the
+        # record went through the logging queue)
         if record.exc_info:
             log_entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_entry["exception"] = record.exc_text
         
         # Add any extra fields (excluding standard LogRecord attributes)
-        standard_attrs = {
-            "name", "msg", "args", "created", "filename", "funcName",
-            "levelname", "levelno", "lineno", "module", "msecs",
-            "pathname", "process", "processName", "relativeCreated",
-            "stack_info", "exc_info", "exc_text", "thread", "threadName",
-            "taskName", "message"
-        }
+        log_entry.update({
+            key: value for key, value in record.__dict__.items()
+            if key not in _STANDARD_ATTRS and not key.startswith("_")
+        })
         
-        for key, value in record.__dict__.items():
-            if key not in standard_attrs and not key.startswith("_"):
-                log_entry[key] = value
-        
-        return json.dumps(log_entry, default=str)
+        return log_entry
+
+
+class _BytesStreamHandler(logging.StreamHandler):
+    """StreamHandler that writes StructuredFormatter.format_bytes() output."""
+    
+    def __init__(self, stream: Any, formatter: StructuredFormatter):
+        super().__init__(stream)
+        self.setFormatter(formatter)
+        self._structured = formatter
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self._structured.format_bytes(record))
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
 
 
 class ContextualLogger(logging.LoggerAdapter):
@@ -102,30 +186,81 @@ class ContextualLogger(logging.LoggerAdapter):
         return msg, kwargs
 
 
+class _ContextQueueHandler(QueueHandler):
+    """
+    QueueHandler that keeps records structured for the listener thread.
+    
+    The stock prepare() replaces msg with the fully formatted text,
+    traceback included, which would flatten the JSON "exception" field.
+    This merges only the message args, renders the traceback to exc_text,
+    and captures the caller's correlation ID before the record leaves
+    its context.
+    """
+    
+    def __init__(self, log_queue: queue.SimpleQueue):
+        super().__init__(log_queue)
+        self._exc_formatter = logging.Formatter()
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        if not record.__dict__.get("correlation_id"):
+            correlation_id = correlation_id_var.get()
+            if correlation_id:
+                record.correlation_id = correlation_id
+        return record
+
+
 # Service-specific loggers cache
 _loggers: dict[str, ContextualLogger] = {}
 _service_name: str = "autoheal"
 
+# Background thread that formats and writes queued records
+_listener: Optional[QueueListener] = None
+
+
+def _stop_listener() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
 
 def setup_logging(
     service_name: str,
     log_level: str = "INFO",
-    json_output: bool = True
+    json_output: bool = True,
+    binary_output: bool = False
 ) -> None:
     """
     Configure logging for a service.
     
     Should be called once at service startup, typically in main.py.
+    Records are queued by the calling thread and formatted and written to
+    stdout by a background listener thread, keeping JSON encoding and
+    stdout writes off the event loop.
     
     Args:
         service_name: Name of the service (e.g., "monitoring")
         log_level: Minimum log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         json_output: If True, output JSON format; otherwise use standard format
+        binary_output: If True, write MessagePack records to stdout instead
+            of JSON lines (requires msgspec)
     
     Example:
         setup_logging(service_name="monitoring", log_level="INFO")
     """
-    global _service_name
+    global _service_name, _listener
     _service_name = service_name
     
     # Get root logger and clear existing handlers
@@ -133,9 +268,14 @@ def setup_logging(
     root_logger.handlers.clear()
     
     # Create handler based on format preference
-    handler = logging.StreamHandler(sys.stdout)
+    handler: logging.StreamHandler = logging.StreamHandler(sys.stdout)
     
-    if json_output:
+    if binary_output:
+        handler = _BytesStreamHandler(
+            sys.stdout.buffer,
+            StructuredFormatter(service_name, format_binary=True)
+        )
+    elif json_output:
         handler.setFormatter(StructuredFormatter(service_name))
     else:
         # Human-readable format for local development
@@ -143,8 +283,16 @@ def setup_logging(
             f"%(asctime)s | {service_name} | %(levelname)s | %(name)s | %(message)s"
         ))
     
-    root_logger.addHandler(handler)
-    root_logger.setLevel(getattr(logging, log_level.upper()))
+    # Format and write on a background thread; callers only enqueue
+    _stop_listener()
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    
+    root_logger.addHandler(_ContextQueueHandler(log_queue))
+    root_logger.setLevel(
+        logging.getLevelNamesMapping().get(log_level.upper(), logging.INFO)
+    )
     
     # Reduce noise from third-party libraries
     logging.getLogger("urllib3").setLevel(logging.WARNING)
@@ -189,7 +337,10 @@ def get_correlation_id() -> Optional[str]:
     """
     Get the current correlation ID from context.
     
+    Thin shim kept for callers outside this package; hot paths read
+    correlation_id_var.get() directly.
+    
     Returns:
         Current correlation ID or None if not set
     """
-    return correlation_id_var.get()
+    return correlation_id_var.get() or None
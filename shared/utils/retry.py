@@ -14,7 +14,11 @@ Usage:
 """
 
 import asyncio
+import random
+import threading
+import time
 from dataclasses import dataclass, field
+from enum import IntEnum
 from functools import wraps
 from typing import Callable, Type, TypeVar, Any, Optional
 from collections.abc import Awaitable
@@ -26,7 +30,7 @@ logger = get_logger(__name__)
 T = TypeVar("T")
 
 
-@dataclass
+@dataclass(slots=True)
 class RetryConfig:
     """
     Configuration for retry behavior.
@@ -36,6 +40,11 @@ class RetryConfig:
         base_delay: Initial delay between retries in seconds
         max_delay: Maximum delay cap in seconds
         backoff_multiplier: Multiplier for exponential backoff
+        jitter: Randomization of each delay: "equal" (backoff +/-
+            jitter_ratio/2 of itself, the default), "full" (uniform between
+            0 and the backoff; opt-in, as delays can be near zero) or
+            "none"; jitter keeps clients from retrying in lockstep
+        jitter_ratio: Spread of "equal" jitter as a fraction of the backoff
         retryable_exceptions: Tuple of exception types that trigger a retry
         on_retry: Optional callback called before each retry
     """
@@ -43,6 +52,8 @@ class RetryConfig:
     base_delay: float = 1.0
     max_delay: float = 60.0
     backoff_multiplier: float = 2.0
+    jitter: str = "equal"
+    jitter_ratio: float = 0.5
     retryable_exceptions: tuple[Type[Exception], ...] = field(
         default_factory=lambda: (Exception,)
     )
@@ -53,7 +64,9 @@ def calculate_delay(
     attempt: int,
     base_delay: float,
     max_delay: float,
-    backoff_multiplier: float
+    backoff_multiplier: float,
+    jitter: str = "equal",
+    jitter_ratio: float = 0.5
 ) -> float:
     """
     Calculate the delay for a given retry attempt using exponential backoff.
@@ -63,12 +76,112 @@ def calculate_delay(
         base_delay: Base delay in seconds
         max_delay: Maximum delay cap
         backoff_multiplier: Multiplier for each successive attempt
+        jitter: "full", "equal" or "none" (see RetryConfig)
+        jitter_ratio: Spread of "equal" jitter as a fraction of the backoff
         
     Returns:
-        Delay in seconds for this attempt
+        Delay in seconds for this attempt, never above max_delay
+        
+    Raises:
+        ValueError: If jitter is not a known mode
+    """
+    delay = min(base_delay * (backoff_multiplier ** attempt), max_delay)
+    
+    if jitter == "none":
+        return delay
+    if jitter == "full":
+        return random.uniform(0, delay)
+    if jitter == "equal":
+        spread = jitter_ratio * delay / 2
+        return min(max(delay + random.uniform(-spread, spread), 0.0), max_delay)
+    raise ValueError(f"Unknown jitter mode: {jitter}")
+
+
+# Shared default for retry_async calls that pass no config
+_DEFAULT_CONFIG = RetryConfig()
+
+
+async def _run_with_retry(
+    func: Callable[..., Awaitable[T]],
+    args: tuple,
+    kwargs: dict,
+    config: RetryConfig
+) -> T:
+    """
+    Run func with retries according to config.
+    
+    Shared loop behind with_retry and retry_async.
+    
+    Args:
+        func: Async function to call
+        args: Positional arguments for func
+        kwargs: Keyword arguments for func
+        config: Retry configuration
+        
+    Returns:
+        Result of the first successful call
     """
-    delay = base_delay * (backoff_multiplier ** attempt)
-    return min(delay, max_delay)
+    last_exception: Optional[Exception] = None
+    
+    for attempt in range(config.max_attempts):
+        try:
+            return await func(*args, **kwargs)
+        
+        except config.retryable_exceptions as e:
+            last_exception = e
+            # functools.partial and other callables have no __name__
+            name = getattr(func, "__name__", repr(func))
+            
+            # Check if we have more attempts
+            if attempt + 1 >= config.max_attempts:
+                logger.error(
+                    "All %d retry attempts exhausted for %s",
+                    config.max_attempts,
+                    name,
+                    extra={
+                        "function": name,
+                        "error": str(e),
+                        "attempts": config.max_attempts
+                    }
+                )
+                raise
+            
+            # Calculate delay for next retry
+            delay = calculate_delay(
+                attempt,
+                config.base_delay,
+                config.max_delay,
+                config.backoff_multiplier,
+                config.jitter,
+                config.jitter_ratio
+            )
+            
+            logger.warning(
+                "Retry %d/%d for %s after %.2fs",
+                attempt + 1,
+                config.max_attempts,
+                name,
+                delay,
+                extra={
+                    "function": name,
+                    "attempt": attempt + 1,
+                    "max_attempts": config.max_attempts,
+                    "delay": delay,
+                    "error": str(e)
+                }
+            )
+            
+            # Call optional retry callback
+            if config.on_retry:
+                config.on_retry(attempt + 1, e)
+            
+            # Wait before retrying
+            await asyncio.sleep(delay)
+    
+    # This should never be reached, but satisfy type checker
+    if last_exception:
+        raise last_exception
+    raise RuntimeError("Retry loop exited unexpectedly")
 
 
 def with_retry(config: Optional[RetryConfig] = None):
@@ -90,7 +203,8 @@ def with_retry(config: Optional[RetryConfig] = None):
             response = await external_api.call()
             return response
             
-        # The above will retry up to 5 times with delays of 0.5s, 1s, 2s, 4s
+        # The above will retry up to 5 times with delays of about
+        # 0.5s, 1s, 2s, 4s, each randomized by +/-25% (equal jitter)
     """
     if config is None:
         config = RetryConfig()
@@ -98,57 +212,7 @@ def with_retry(config: Optional[RetryConfig] = None):
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> T:
-            last_exception: Optional[Exception] = None
-            
-            for attempt in range(config.max_attempts):
-                try:
-                    return await func(*args, **kwargs)
-                
-                except config.retryable_exceptions as e:
-                    last_exception = e
-                    
-                    # Check if we have more attempts
-                    if attempt + 1 >= config.max_attempts:
-                        logger.error(
-                            f"All {config.max_attempts} retry attempts exhausted for {func.__name__}",
-                            extra={
-                                "function": func.__name__,
-                                "error": str(e),
-                                "attempts": config.max_attempts
-                            }
-                        )
-                        raise
-                    
-                    # Calculate delay for next retry
-                    delay = calculate_delay(
-                        attempt,
-                        config.base_delay,
-                        config.max_delay,
-                        config.backoff_multiplier
-                    )
-                    
-                    logger.warning(
-                        f"Retry {attempt + 1}/{config.max_attempts} for {func.__name__} after {delay:.2f}s",
-                        extra={
-                            "function": func.__name__,
-                            "attempt": attempt + 1,
-                            "max_attempts": config.max_attempts,
-                            "delay": delay,
-                            "error": str(e)
-                        }
-                    )
-                    
-                    # Call optional retry callback
-                    if config.on_retry:
-                        config.on_retry(attempt + 1, e)
-                    
-                    # Wait before retrying
-                    await asyncio.sleep(delay)
-            
-            # This should never be reached, but satisfy type checker
-            if last_exception:
-                raise last_exception
-            raise RuntimeError("Retry loop exited unexpectedly")
+            return await _run_with_retry(func, args, kwargs, config)
         
         return wrapper
     return decorator
@@ -182,13 +246,20 @@ async def retry_async(
         )
     """
     if config is None:
-        config = RetryConfig()
+        config = _DEFAULT_CONFIG
     
-    @with_retry(config)
-    async def wrapper() -> T:
-        return await func(*args, **kwargs)
-    
-    return await wrapper()
+    return await _run_with_retry(func, args, kwargs, config)
+
+
+class CircuitState(IntEnum):
+    """Circuit breaker states; ints so hot-path checks are integer compares."""
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
+
+# Public string form of each state, as reported by CircuitBreaker.state
+_STATE_NAMES = {state: state.name.lower() for state in CircuitState}
 
 
 class CircuitBreaker:
@@ -219,10 +290,22 @@ class CircuitBreaker:
                 raise
     """
     
+    # Public state names, as returned by the state property
     CLOSED = "closed"
     OPEN = "open"
     HALF_OPEN = "half_open"
     
+    __slots__ = (
+        "_failure_count",
+        "_half_open_calls",
+        "_last_failure_time",
+        "_lock",
+        "_state",
+        "failure_threshold",
+        "half_open_max_calls",
+        "reset_timeout",
+    )
+    
     def __init__(
         self,
         failure_threshold: int = 5,
@@ -241,74 +324,87 @@ class CircuitBreaker:
         self.reset_timeout = reset_timeout
         self.half_open_max_calls = half_open_max_calls
         
-        self._state = self.CLOSED
+        self._state = CircuitState.CLOSED
         self._failure_count = 0
         self._last_failure_time: Optional[float] = None
         self._half_open_calls = 0
+        # Guards state transitions; callers may share a breaker across
+        # threads (e.g. executor workers), so the counters need one owner
+        self._lock = threading.Lock()
     
     @property
     def state(self) -> str:
-        """Get current circuit state."""
-        return self._state
+        """Get current circuit state ("closed", "open" or "half_open")."""
+        return _STATE_NAMES[self._state]
     
     def can_execute(self) -> bool:
         """Check if a request can be executed."""
-        if self._state == self.CLOSED:
+        # Lock-free fast path for the common CLOSED case
+        state = self._state
+        if state == CircuitState.CLOSED:
             return True
         
-        if self._state == self.OPEN:
-            # Check if reset timeout has passed
-            if self._last_failure_time is not None:
-                import time
-                elapsed = time.time() - self._last_failure_time
-                if elapsed >= self.reset_timeout:
-                    self._state = self.HALF_OPEN
-                    self._half_open_calls = 0
-                    logger.info("Circuit breaker entering half-open state")
-                    return True
-            return False
-        
-        if self._state == self.HALF_OPEN:
-            return self._half_open_calls < self.half_open_max_calls
-        
-        return False
+        with self._lock:
+            state = self._state
+            if state == CircuitState.OPEN:
+                # Check if reset timeout has passed
+                last_failure_time = self._last_failure_time
+                if last_failure_time is None or (
+                    time.monotonic() - last_failure_time < self.reset_timeout
+                ):
+                    return False
+                self._state = state = CircuitState.HALF_OPEN
+                self._half_open_calls = 0
+                logger.info("Circuit breaker entering half-open state")
+            
+            if state == CircuitState.HALF_OPEN:
+                # Only let the configured number of probes through
+                if self._half_open_calls >= self.half_open_max_calls:
+                    return False
+                self._half_open_calls += 1
+                return True
+            
+            return state == CircuitState.CLOSED
     
     def record_success(self) -> None:
         """Record a successful execution."""
-        if self._state == self.HALF_OPEN:
-            # Service recovered, close the circuit
-            self._state = self.CLOSED
-            self._failure_count = 0
-            logger.info("Circuit breaker closed - service recovered")
-        elif self._state == self.CLOSED:
-            # Reset failure count on success
-            self._failure_count = 0
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                # Service recovered, close the circuit
+                self._state = CircuitState.CLOSED
+                self._failure_count = 0
+                logger.info("Circuit breaker closed - service recovered")
+            elif self._state == CircuitState.CLOSED:
+                # Reset failure count on success
+                self._failure_count = 0
     
     def record_failure(self) -> None:
         """Record a failed execution."""
-        import time
-        
-        self._failure_count += 1
-        self._last_failure_time = time.time()
-        
-        if self._state == self.HALF_OPEN:
-            # Failed during recovery test, reopen
-            self._state = self.OPEN
-            logger.warning("Circuit breaker reopened - recovery failed")
-        
-        elif self._state == self.CLOSED:
-            if self._failure_count >= self.failure_threshold:
-                self._state = self.OPEN
-                logger.warning(
-                    f"Circuit breaker opened after {self._failure_count} failures"
-                )
+        with self._lock:
+            self._failure_count += 1
+            # Monotonic, so wall-clock adjustments cannot stretch or skip the
+            # reset timeout
+            self._last_failure_time = time.monotonic()
+            
+            if self._state == CircuitState.HALF_OPEN:
+                # Failed during recovery test, reopen
+                self._state = CircuitState.OPEN
+                logger.warning("Circuit breaker reopened - recovery failed")
+            
+            elif self._state == CircuitState.CLOSED:
+                if self._failure_count >= self.failure_threshold:
+                    self._state = CircuitState.OPEN
+                    logger.warning(
+                        f"Circuit breaker opened after {self._failure_count} failures"
+                    )
     
     def reset(self) -> None:
         """Manually reset the circuit breaker to closed state."""
-        self._state = self.CLOSED
-        self._failure_count = 0
-        self._last_failure_time = None
-        self._half_open_calls = 0
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failure_count = 0
+            self._last_failure_time = None
+            self._half_open_calls = 0
         logger.info("Circuit breaker manually reset")
 
 